@@ -0,0 +1,123 @@
+import sys
+import argparse
+
+OUTPUT_FORMATS = ["excel", "ndjson", "arrow"]
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+def build_parser():
+    """
+  This function builds the command-line parser. It only uses the standard library, so that parsing the arguments
+  (and e.g. printing the help) does not import pandas, pydantic or the GUI stack.
+  """
+    parser = argparse.ArgumentParser(prog="op-points", description="Find operational points and their mean values.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the analysis without the GUI.")
+    run_parser.add_argument("-c", "--config", default="config.yaml", help="Path of the YAML config file.")
+    run_parser.add_argument("-i", "--input", required=True, nargs="+",
+                            help="Path of the input CSV, Excel or database file, or '-' to read CSV data from stdin. "
+                                 "Several files are analysed in a pipeline, with one output sub dir per file.")
+    run_parser.add_argument("-o", "--output-dir", default=None,
+                            help="Directory for the output files (required for the Excel format, optional otherwise).")
+    run_parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="excel",
+                            help="'excel' writes the Excel files to the output dir, 'ndjson' and 'arrow' write the "
+                                 "operational points to stdout.")
+    run_parser.add_argument("--no-intermediate", action="store_true",
+                            help="Do not write the filtered input data (input_file_filtered.xlsx) to the output dir "
+                                 "(it is only written with the Excel format).")
+    run_parser.add_argument("--engine", default=None,
+                            help="Detection engine ('reference', 'vectorized', ...), overrides the engine of the config.")
+    run_parser.add_argument("--verify", action="store_true",
+                            help="Cross-check the detection engine against the reference engine on a sampled slice "
+                                 "of the data, and report any differing points in the run report.")
+    run_parser.add_argument("--prefetch", type=int, default=2,
+                            help="Number of input files read ahead of the detection when several files are given.")
+    run_parser.add_argument("--log-level", choices=LOG_LEVELS, default="INFO", help="Level of the console logging.")
+    run_parser.set_defaults(handler=run_command)
+
+    gui_parser = subparsers.add_parser("gui", help="Open the config editor GUI.")
+    gui_parser.set_defaults(handler=gui_command)
+    return parser
+
+def run_command(args):
+    """
+  This function runs the analysis for the given config and input, and writes the operational points either as Excel
+  files to the output dir or as NDJSON/Arrow IPC to stdout (logs always go to stderr).
+  """
+    # imported here, so that only the analysis path pays for importing pandas & co.
+    from main import analyse_operational_points, analyse_input_files
+    from data_manager.export import write_ndjson, write_arrow_ipc, flatten_results
+
+    if args.format == "excel" and not args.output_dir:
+        raise ValueError("The Excel output format requires an output dir (--output-dir).")
+    if len(args.input) > 1 and "-" in args.input:
+        raise ValueError("Reading from stdin ('-') is only supported for a single input.")
+    if args.prefetch < 1:
+        raise ValueError("The prefetch value must be at least 1.")
+
+    config_overrides = {}
+    if args.engine:
+        config_overrides["engine"] = args.engine
+    if args.verify:
+        config_overrides["verify_fraction"] = 1.0
+
+    # the stdout formats are meant for pipelines, so they never write the filtered data file
+    to_stdout = args.format != "excel"
+    save_filtered = not args.no_intermediate and not to_stdout
+    if len(args.input) == 1:
+        input_file = sys.stdin.buffer if args.input[0] == "-" else args.input[0]
+        _, _, additional_info_df = analyse_operational_points(
+            args.config, input_file, args.output_dir,
+            save_filtered=save_filtered,
+            save_excel=not to_stdout,
+            log_level=args.log_level,
+            config_overrides=config_overrides
+        )
+        # several profiles or time windows: one record per operational point, profile and window
+        additional_info_df = flatten_results(additional_info_df)
+    else:
+        results = analyse_input_files(
+            args.config, args.input, args.output_dir,
+            save_filtered=save_filtered,
+            save_excel=not to_stdout,
+            log_level=args.log_level,
+            prefetch=args.prefetch,
+            config_overrides=config_overrides
+        )
+        # one record per operational point and input file (and profile and window)
+        import pandas as pd
+        additional_info_df = pd.concat(
+            [flatten_results(info).assign(input_file=input_file) for input_file, (_, _, info) in results.items()],
+            ignore_index=True
+        )
+
+    if args.format == "ndjson":
+        write_ndjson(additional_info_df, sys.stdout)
+    elif args.format == "arrow":
+        write_arrow_ipc(additional_info_df, sys.stdout.buffer)
+    return 0
+
+def gui_command(args):
+    """
+  This function opens the config editor GUI.
+  """
+    # imported here, so that the headless commands never import tkinter/ttkbootstrap
+    from core.config_editor_gui import launch_gui
+
+    launch_gui()
+    return 0
+
+def main(argv=None):
+    """
+  This function is the entry point of the "op-points" console script and of "python -m cli".
+  """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as ve:
+        # the error was already logged by log_and_raise_error
+        print(f"Error: {ve}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,25 @@
-import os
-import sys
+import json
 import yaml
+import hashlib
 import logging
-from config.validate_config import validate_config
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.logging_setup import log_and_raise_error
 
-def load_validate_config(config_file):
+def load_validate_config(config_file, overrides=None):
     """
   This function loads and validates the configuration from the YAML file, and returns the time_column 
-  and needed_columns in lowercase.
+  and needed_columns in lowercase. Overrides (e.g. from the command line) replace the values of the file.
   """
+    # imported here, since pydantic is only needed once a config is actually validated
+    from config.validate_config import validate_config
+
     try:
         with open(config_file, "r") as f:
             config = yaml.safe_load(f)
         logging.info("Configuration file %s loaded successfully.", config_file)
+        if overrides:
+            config = {**(config or {}), **overrides}
 
-        validate_config(config)
+        config = validate_config(config)
         logging.info("Configuration validated successfully.")
 
         # extract and convert to lowercase
@@ -52,3 +54,34 @@ def get_needed_columns(config):
     mean_values = [col.lower() for col in config["mean_values"]]
 
     return needed_columns, mean_values
+
+
+# config keys that only control how the data is read and processed or where results are written,
+# they do not change the results
+OUTPUT_ONLY_KEYS = ("plant", "result_store", "cache_dir", "cache_max_entries", "time_index", "backend", "engine",
+                    "verify_fraction", "verify_rows", "memmap_dir")
+
+def get_config_hash(config):
+    """
+  This function returns a short canonical hash of the validated config, so that stored results can be traced back
+  to the config that produced them. Keys that only control how the data is read and processed or where results
+  are written are ignored.
+  """
+    relevant_config = {key: value for key, value in config.items() if key not in OUTPUT_ONLY_KEYS}
+    canonical_config = json.dumps(relevant_config, sort_keys=True, default=str)
+    return hashlib.sha256(canonical_config.encode("utf-8")).hexdigest()[:16]
+
+def get_profile_configs(config):
+    """
+  This function returns, for every profile of a multi-profile config, its name, its config (the top-level config
+  with the profile's overrides), its needed columns and its mean values (in lowercase).
+  """
+    from config.validate_config import PROFILE_KEYS
+
+    profiles = []
+    for profile in config["profiles"]:
+        profile_config = {**config, "profiles": None}
+        profile_config.update({key: profile[key] for key in PROFILE_KEYS if key in profile})
+        needed_columns, mean_values = get_needed_columns(profile_config)
+        profiles.append((profile["name"], profile_config, needed_columns, mean_values))
+    return profiles
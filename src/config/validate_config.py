@@ -1,13 +1,21 @@
-import os
-import sys
-from typing import List, Dict, Any, Optional
+import re
+import pandas as pd
+from typing import List, Dict, Any, Literal, Optional, Union
 from pydantic import BaseModel, Field, ValidationError
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.logging_setup import log_and_raise_error
 
+# config keys that a profile of a multi-profile config can override
+PROFILE_KEYS = ("conditions", "margins", "mean_values", "time_window")
+
+# characters that are not allowed in profile names, which are used as output sub dir names (path separators,
+# characters reserved on Windows and control characters)
+INVALID_NAME_CHARACTERS = re.compile(r'[\\/<>:"|?*\x00-\x1f]')
+
 class ConfigSchema(BaseModel):
-    time_window: int = Field(..., ge=0, description="Time window must be 0 or a positive integer.")
+    time_window: Union[int, List[int]] = Field(
+        ...,
+        description="Time window must be 0 or a positive integer, or a list of them (one result set per window)."
+    )
     row_to_remove: Optional[str] = Field(None, description="Row to remove must be a valid datetime string or None.")
     time_column: str = Field(..., min_length=1, description="Time column must be a non-empty string.")
     mean_values: List[str] = Field(..., min_items=1, description="There must be at least one mean values.")
@@ -17,6 +25,25 @@ class ConfigSchema(BaseModel):
         min_items=1,
         description="Margins must contain at least one entry, with column names and margin values."
     )
+    profiles: Optional[List[Dict[str, Any]]] = Field(
+        None,
+        description="Profiles must be a list of named entries that can override conditions, margins, mean_values and time_window."
+    )
+    start: Optional[str] = Field(None, description="Start of the analysed time range must be a valid datetime string or None.")
+    end: Optional[str] = Field(None, description="End of the analysed time range must be a valid datetime string or None.")
+    time_index: bool = Field(True, description="Time index must be a boolean.")
+    table: Optional[str] = Field(None, description="Table of a SQLite or DuckDB input file or None.")
+    query: Optional[str] = Field(None, description="SQL query on a SQLite or DuckDB input file or None.")
+    engine: str = Field("vectorized", description="Engine must be the name of a registered detection engine.")
+    verify_fraction: float = Field(0.0, ge=0, le=1, description="Verify fraction must be between 0 and 1.")
+    verify_rows: int = Field(2000, ge=1, description="Verify rows must be a positive integer.")
+    backend: Literal["pandas", "polars"] = Field("pandas", description="Backend must be 'pandas' or 'polars'.")
+    export_score: bool = Field(False, description="Export score must be a boolean.")
+    plant: Optional[str] = Field(None, description="Plant name used to partition the result store.")
+    result_store: Optional[str] = Field(None, description="Directory of the append-only Parquet result store or None.")
+    cache_dir: Optional[str] = Field(None, description="Directory of the result cache or None to disable caching.")
+    cache_max_entries: int = Field(16, ge=1, description="Cache max entries must be a positive integer.")
+    memmap_dir: Optional[str] = Field(None, description="Directory of the memory-mapped column stores or None.")
 
     @staticmethod
     def validate_margin_entry(margin_entry: Dict[str, Any]) -> None:
@@ -29,6 +56,50 @@ class ConfigSchema(BaseModel):
             raise ValueError("Each margin entry must have a 'margin' key with an int or float value.")
         if margin_entry["margin"] <= 0:
             raise ValueError("The 'margin' value must be greater than 0.")
+        if "max_violation_fraction" in margin_entry:
+            fraction = margin_entry["max_violation_fraction"]
+            if isinstance(fraction, bool) or not isinstance(fraction, (int, float)) or not 0 <= fraction < 1:
+                raise ValueError("The 'max_violation_fraction' value must be a number from 0 to below 1.")
+
+    @staticmethod
+    def validate_time_window(time_window: Any) -> None:
+        """
+      This method validates the time window (a single window or a list of windows).
+      """
+        time_windows = time_window if isinstance(time_window, list) else [time_window]
+        if not time_windows:
+            raise ValueError("The 'time_window' list must contain at least one window.")
+        for window in time_windows:
+            if isinstance(window, bool) or not isinstance(window, int) or window < 0:
+                raise ValueError("Each 'time_window' must be 0 or a positive integer.")
+        if len(set(time_windows)) != len(time_windows):
+            raise ValueError("The 'time_window' list must not contain duplicates.")
+
+    @staticmethod
+    def validate_time_range(start: Any, end: Any) -> None:
+        """
+      This method validates the optional time range (start and end datetime strings).
+      """
+        bounds = {}
+        for name, value in (("start", start), ("end", end)):
+            if value is None:
+                continue
+            try:
+                bounds[name] = pd.Timestamp(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"The '{name}' value must be a valid datetime string.")
+        if len(bounds) == 2 and bounds["start"] > bounds["end"]:
+            raise ValueError("The 'start' value must not be after the 'end' value.")
+
+    @staticmethod
+    def validate_engine(engine: Any) -> None:
+        """
+      This method validates the name of the detection engine.
+      """
+        from core.engines import ENGINES
+
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown detection engine '{engine}'. Available engines: {', '.join(ENGINES)}.")
 
     @classmethod
     def validate_margins(cls, margins: List[Dict[str, Any]]) -> None:
@@ -38,13 +109,53 @@ class ConfigSchema(BaseModel):
         for margin in margins:
             cls.validate_margin_entry(margin)
 
+    @classmethod
+    def validate_profiles(cls, profiles: List[Dict[str, Any]]) -> None:
+        """
+      This method validates the profiles of a multi-profile config.
+      """
+        names = []
+        for profile in profiles:
+            if not isinstance(profile, dict) or not isinstance(profile.get("name"), str) or not profile["name"]:
+                raise ValueError("Each profile must have a 'name' key with a non-empty string value.")
+            if INVALID_NAME_CHARACTERS.search(profile["name"]) or profile["name"].strip(" .") != profile["name"]:
+                raise ValueError(f"Profile name '{profile['name']}' is not a valid directory name: It must not contain "
+                                 f"path separators or any of <>:\"|?*, and must not start or end with a dot or space.")
+            unknown_keys = set(profile) - {"name"} - set(PROFILE_KEYS)
+            if unknown_keys:
+                raise ValueError(f"Profile '{profile['name']}' has unsupported keys: {', '.join(sorted(unknown_keys))}.")
+            if "time_window" in profile:
+                cls.validate_time_window(profile["time_window"])
+            if "margins" in profile:
+                if not profile["margins"]:
+                    raise ValueError(f"Profile '{profile['name']}' must contain at least one margin.")
+                cls.validate_margins(profile["margins"])
+            if "conditions" in profile and not isinstance(profile["conditions"], dict):
+                raise ValueError(f"The conditions of profile '{profile['name']}' must be a dictionary.")
+            if "mean_values" in profile and not profile["mean_values"]:
+                raise ValueError(f"Profile '{profile['name']}' must contain at least one mean value.")
+            names.append(profile["name"])
+        if len(set(names)) != len(names):
+            raise ValueError("The profile names must be unique.")
+
     @classmethod
     def validate(cls, config: dict) -> "ConfigSchema":
         """
       This method performs custom validation for the entire config.
       """
-        # validate margins
+        # validate time window and margins
+        if "time_window" in config:
+            cls.validate_time_window(config["time_window"])
         cls.validate_margins(config.get("margins", []))
+        cls.validate_time_range(config.get("start"), config.get("end"))
+        if "engine" in config:
+            cls.validate_engine(config["engine"])
+        if config.get("memmap_dir") and config.get("engine", "vectorized") != "vectorized":
+            raise ValueError("The memory-mapped mode ('memmap_dir') only supports the 'vectorized' engine.")
+        if config.get("table") and config.get("query"):
+            raise ValueError("Only one of 'table' and 'query' can be set.")
+        if config.get("profiles"):
+            cls.validate_profiles(config["profiles"])
         # use BaseModel's validation for remaining fields
         return cls(**config)
 
@@ -25,6 +25,7 @@ class ConfigEditorGUI(ttkb.Window):
         
         self.input_file = ttkb.StringVar()
         self.output_dir = ttkb.StringVar()
+        self.save_filtered = ttkb.BooleanVar(value=True)
         
         self.default_config_path = os.path.join("config.yaml")
         self.custom_config_data = None
@@ -54,8 +55,14 @@ class ConfigEditorGUI(ttkb.Window):
         ttkb.Entry(output_frame, textvariable=self.output_dir, width=50).pack(side="left", padx=5)
         ttkb.Button(output_frame, text="Browse", bootstyle=INFO, command=self.select_output_dir).pack(side="left", padx=5)
 
-        # "Run Default Config" Button
-        ttkb.Button(self, text="Run Default Config", bootstyle=PRIMARY, command=self.run_default).grid(row=2, column=0, padx=10, pady=10, sticky="w")
+        # "Run Default Config" Button and the option to write the filtered data (not needed for the results preview)
+        run_frame = ttkb.Frame(self)
+        run_frame.grid(row=2, column=0, padx=10, pady=10, sticky="w")
+
+        ttkb.Button(run_frame, text="Run Default Config", bootstyle=PRIMARY, command=self.run_default).pack(side="left")
+        ttkb.Checkbutton(
+            run_frame, text="Save Filtered Data", variable=self.save_filtered, bootstyle="primary-round-toggle"
+        ).pack(side="left", padx=15)
 
         # custom Configuration Option
         self.custom_input_var = ttkb.BooleanVar()
@@ -99,7 +106,7 @@ class ConfigEditorGUI(ttkb.Window):
         if not self.input_file.get() or not self.output_dir.get():
             messagebox.showwarning("Warning", "Please select input and output paths!")
             return
-        run_main(self.default_config_path, self.input_file.get(), self.output_dir.get())
+        run_main(self.default_config_path, self.input_file.get(), self.output_dir.get(), self.save_filtered.get())
 
     def toggle_custom_input(self):
         """
@@ -344,7 +351,7 @@ class ConfigEditorGUI(ttkb.Window):
                 temp_config_file_path = temp_config_file.name
 
             # run the main process with the temporary config file path
-            run_main(temp_config_file_path, self.input_file.get(), self.output_dir.get())
+            run_main(temp_config_file_path, self.input_file.get(), self.output_dir.get(), self.save_filtered.get())
 
         except ValueError as ve:
             messagebox.showerror("Validation Error", str(ve))
@@ -352,13 +359,22 @@ class ConfigEditorGUI(ttkb.Window):
             logging.error("Unexpected error: %s", e, exc_info=True)
             messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
-def run_main(config_file, input_file, output_dir):
+def run_main(config_file, input_file, output_dir, save_filtered=True):
     """
-  This function calls the main.py script to generate the operational points analysis 
+  This function calls the main.py script to generate the operational points analysis, and offers a preview of the
+  detected operational points (the GUI is closed if it is declined)
   """
     try:
-        analyse_operational_points(config_file, input_file, output_dir)
+        filtered_data, op_points, _ = analyse_operational_points(config_file, input_file, output_dir,
+                                                                 save_filtered=save_filtered)
         messagebox.showinfo("Success", "Script executed successfully!")
+        if filtered_data is None:
+            # the results were loaded from the result cache, or detected on memory-mapped files
+            messagebox.showinfo("Preview", "The filtered data is not in memory (cached results or memory-mapped "
+                                           "mode), the preview is not available.")
+        elif messagebox.askyesno("Preview", "Show a preview of the detected operational points?"):
+            show_results(config_file, filtered_data, op_points)
+            return
         app.destroy()
     except ValueError as ve:
         messagebox.showerror("Validation Error", str(ve))
@@ -367,6 +383,24 @@ def run_main(config_file, input_file, output_dir):
         error_message = f"An unexpected error occurred:\n{str(e)}"
         messagebox.showerror("Error", error_message)
         
-if __name__ == "__main__":
+def show_results(config_file, filtered_data, op_points):
+    """
+  This function opens the results preview with the in-memory filtered data (matplotlib is imported lazily).
+  """
+    from config.config_loader import load_validate_config
+    from core.results_view import ResultsView, get_preview_sets
+
+    time_col, _, _, config = load_validate_config(config_file)
+    ResultsView(app, time_col, get_preview_sets(config, filtered_data, op_points))
+
+def launch_gui():
+    """
+  This function opens the config editor GUI and blocks until it is closed.
+  """
+    global app
     app = ConfigEditorGUI()
     app.mainloop()
+
+if __name__ == "__main__":
+    launch_gui()
+
@@ -0,0 +1,167 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+from core.steady_state import compute_steady_state_score
+from core.operational_points import find_operational_points
+from core.multiresolution import find_operational_points_for_windows, get_time_windows
+
+# engine used if none is configured
+DEFAULT_ENGINE = "vectorized"
+
+# engine the other engines are verified against
+REFERENCE_ENGINE = "reference"
+
+# number of slices the engines are verified on, and number of (longest) time windows spanned by every slice
+VERIFY_SLICES = 3
+VERIFY_WINDOWS = 10
+
+def detect_reference(data, time_col, mean_values, config):
+    """
+  This function runs the reference loop (core.operational_points) for every time window, without skipping rows.
+  The steady-state score is only computed if it is exported.
+  """
+    results = {}
+    for time_window in get_time_windows(config):
+        window_config = {**config, "time_window": time_window}
+        op_points_df, additional_info_df = find_operational_points(data, time_col, mean_values, window_config)
+        score = None
+        if config.get("export_score"):
+            score, _ = compute_steady_state_score(data, time_col, config.get("margins", []), time_window)
+        results[time_window] = (op_points_df, additional_info_df, score, None)
+    return results
+
+def detect_vectorized(data, time_col, mean_values, config):
+    """
+  This function runs the array-based engine (core.multiresolution) with the steady-state pre-pass for all time
+  windows on the same data, sharing the min/max pyramids between the windows.
+  """
+    return find_operational_points_for_windows(data, time_col, mean_values, config)
+
+# registered detection engines: every engine takes (data, time_col, mean_values, config) and returns
+# {time_window: (op_points_df, additional_info_df, score, candidates)}, with the same DataFrames as the reference
+ENGINES = {
+    "reference": detect_reference,
+    "vectorized": detect_vectorized
+}
+
+def register_engine(name, engine):
+    """
+  This function registers an additional detection engine under the given name.
+  """
+    ENGINES[name] = engine
+
+def get_engine(name):
+    """
+  This function returns the detection engine registered under the given name.
+  """
+    if name not in ENGINES:
+        log_and_raise_error(f"Unknown detection engine '{name}'. Available engines: {', '.join(ENGINES)}.")
+    return ENGINES[name]
+
+def run_engine(name, data, time_col, mean_values, config):
+    """
+  This function finds the operational points with the given engine, for every configured time window.
+  """
+    logging.info(f"Detection engine: {name}")
+    return get_engine(name)(data, time_col, mean_values, config)
+
+def compare_results(time_col, results, reference_results):
+    """
+  This function compares the operational points and mean values of an engine with the ones of the reference engine,
+  and returns the differences per time window (points only found by one of them, and points with different values).
+  """
+    differences = {}
+    for time_window, (_, additional_info_df, _, _) in reference_results.items():
+        expected = additional_info_df.set_index(time_col) if not additional_info_df.empty else pd.DataFrame()
+        actual = results[time_window][1]
+        actual = actual.set_index(time_col) if not actual.empty else pd.DataFrame()
+
+        only_engine = actual.index.difference(expected.index)
+        only_reference = expected.index.difference(actual.index)
+        common = actual.index.intersection(expected.index)
+        if list(actual.columns) == list(expected.columns):
+            actual_values, expected_values = actual.loc[common], expected.loc[common]
+            same = (actual_values == expected_values) | (actual_values.isna() & expected_values.isna())
+            different_values = common[~same.all(axis=1).values]
+        else:
+            different_values = common
+
+        if len(only_engine) or len(only_reference) or len(different_values):
+            differences[time_window] = {
+                "only_engine": [str(point) for point in only_engine],
+                "only_reference": [str(point) for point in only_reference],
+                "different_values": [str(point) for point in different_values]
+            }
+    return differences
+
+def get_verify_slices(data, time_col, config, sample_rows, rng):
+    """
+  This function returns the (start, stop) rows of the slices the engines are verified on: up to VERIFY_SLICES
+  non-overlapping slices at random positions, each spanning at least VERIFY_WINDOWS of the longest time window
+  (from the median sampling interval) and at least sample_rows rows. All the data is one slice if it is too short.
+  """
+    times = data[time_col].values.astype("datetime64[ns]").view("int64")
+    step = np.median(np.diff(times)) if len(times) > 1 else 0
+    window_rows = int(np.ceil(max(get_time_windows(config)) * 60e9 / step)) if step > 0 else len(data)
+    slice_rows = max(sample_rows, VERIFY_WINDOWS * window_rows)
+
+    slices = min(VERIFY_SLICES, len(data) // slice_rows)
+    if slices < 1 or slices * slice_rows >= len(data):
+        return [(0, len(data))]
+
+    # one slice at a random position within every segment, so that the slices do not overlap
+    segment_rows = len(data) // slices
+    return [(start, start + slice_rows) for start in
+            (segment * segment_rows + int(rng.integers(0, segment_rows - slice_rows + 1)) for segment in range(slices))]
+
+def verify_engine(name, data, time_col, mean_values, config, sample_rows, rng=None):
+    """
+  This function cross-checks an engine against the reference engine on a few randomly placed slices of the data,
+  each spanning several time windows (see get_verify_slices), so that the overhead is bounded whatever the size of
+  the data. Both engines run on the same slices, and every differing point is logged and reported. The verification
+  is inconclusive (passed is None) if the engines could not run or the reference found no operational points in the
+  slices. It returns the verification report.
+  """
+    rng = rng if rng is not None else np.random.default_rng()
+    report = {"engine": name, "reference": REFERENCE_ENGINE, "rows": 0, "points": 0, "slices": []}
+    differences = {}
+
+    for start, stop in get_verify_slices(data, time_col, config, sample_rows, rng):
+        sample = data.iloc[start:stop].reset_index(drop=True)
+        slice_report = {
+            "rows": len(sample),
+            "start": str(sample[time_col].iloc[0]) if len(sample) else None,
+            "end": str(sample[time_col].iloc[-1]) if len(sample) else None
+        }
+        report["slices"].append(slice_report)
+        try:
+            results = run_engine(name, sample, time_col, mean_values, config)
+            reference_results = run_engine(REFERENCE_ENGINE, sample, time_col, mean_values, config)
+        except ValueError as e:
+            # e.g. a slice shorter than the time window (the error was already logged)
+            slice_report["error"] = str(e)
+            continue
+
+        slice_report["points"] = sum(len(result[0]) for result in reference_results.values())
+        report["rows"] += len(sample)
+        report["points"] += slice_report["points"]
+        for time_window, window_differences in compare_results(time_col, results, reference_results).items():
+            for key, points in window_differences.items():
+                differences.setdefault(time_window, {"only_engine": [], "only_reference": [], "different_values": []})
+                differences[time_window][key].extend(points)
+
+    if differences:
+        report.update({"passed": False, "inconclusive": False, "differences": differences})
+        logging.warning(f"Engine verification: '{name}' differs from the reference engine on {report['rows']} rows "
+                        f"({len(report['slices'])} slices): {differences}")
+    elif not report["rows"] or not report["points"]:
+        reason = "the engines could not run on the sampled slices" if not report["rows"] \
+            else "the reference engine found no operational points in the sampled slices"
+        report.update({"passed": None, "inconclusive": True, "reason": reason, "differences": {}})
+        logging.warning(f"Engine verification: Inconclusive, {reason}.")
+    else:
+        report.update({"passed": True, "inconclusive": False, "differences": {}})
+        logging.info(f"Engine verification: '{name}' matches the reference engine on {report['rows']} rows "
+                     f"({len(report['slices'])} slices, {report['points']} operational points).")
+    return report
@@ -0,0 +1,288 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+from core.operational_points import get_allowed_violations
+from core.steady_state import compute_steady_state_score, compute_candidates_in_chunks
+
+# number of samples aggregated by a block of the finest pyramid level, and blocks per block of the next level
+BLOCK_SIZE = 32
+LEVEL_FACTOR = 8
+
+# first and largest number of rows of the candidates mask scanned at once for the next candidate
+MIN_SCAN_ROWS = 256
+MAX_SCAN_ROWS = 65536
+
+def build_pyramid(values, block_size=BLOCK_SIZE, level_factor=LEVEL_FACTOR):
+    """
+  This function builds a pyramid of per-block min/max aggregates of the values, from blocks of block_size samples
+  up to a single block. NaN values propagate into the aggregates, so a NaN block contains at least one NaN sample.
+  """
+    levels = []
+    mins = maxs = values
+    while len(mins) > 1:
+        factor = block_size if not levels else level_factor
+        starts = np.arange(0, len(mins), factor)
+        mins, maxs = np.minimum.reduceat(mins, starts), np.maximum.reduceat(maxs, starts)
+        current_block_size = block_size if not levels else levels[-1]["block_size"] * level_factor
+        levels.append({"block_size": current_block_size, "min": mins, "max": maxs})
+    return levels
+
+def build_margin_pyramids(data, margins):
+    """
+  This function builds the pyramids of all margin columns once (after filtering), so that they can be shared by
+  all detection runs on the same data. It returns {column: (values, pyramid)}.
+  """
+    pyramids = {}
+    for rule in margins:
+        column = rule["column"]
+        if column not in data.columns:
+            log_and_raise_error(f"Column '{column}' defined in margins is not in the data.")
+        if column not in pyramids:
+            values = np.ascontiguousarray(data[column].values, dtype=float)
+            pyramids[column] = (values, build_pyramid(values))
+    return pyramids
+
+def check_within_margin(values, pyramid, lo, hi, middle, margin, max_violations=0):
+    """
+  This function checks if all values[lo:hi] (all but at most max_violations of them) are within margin of the
+  middle value. It first decides with the coarsest pyramid level that has full blocks in the range: full blocks
+  outside the margin reject (for a strict check any violating or NaN block, otherwise blocks entirely outside the
+  margin, whose samples are all violations, if they are more than allowed), and blocks covering the range that are all
+  within the margin accept. Only undecided ranges are checked sample by sample, so the result is exactly the one of
+  the full-resolution check.
+  """
+    if hi <= lo:
+        return True
+
+    level = None
+    for candidate_level in pyramid:
+        if 2 * candidate_level["block_size"] > hi - lo:
+            break
+        level = candidate_level
+
+    if level is not None:
+        block_size = level["block_size"]
+
+        # blocks fully inside the range: their violations are violations of the range
+        first_full, last_full = -(-lo // block_size), hi // block_size
+        inner_min, inner_max = level["min"][first_full:last_full], level["max"][first_full:last_full]
+        if max_violations == 0:
+            if np.isnan(inner_max).any() or (inner_max - middle > margin).any() or (middle - inner_min > margin).any():
+                return False
+        else:
+            outside_blocks = np.count_nonzero((inner_min - middle > margin) | (middle - inner_max > margin))
+            if outside_blocks * block_size > max_violations:
+                return False
+
+        # blocks covering the range: if they are all within the margin, so is the range
+        first_cover, last_cover = lo // block_size, (hi - 1) // block_size + 1
+        cover_min, cover_max = level["min"][first_cover:last_cover].min(), level["max"][first_cover:last_cover].max()
+        if cover_max - middle <= margin and middle - cover_min <= margin:
+            return True
+
+    if max_violations == 0:
+        return bool(np.all(np.abs(values[lo:hi] - middle) <= margin))
+    return int(np.count_nonzero(~(np.abs(values[lo:hi] - middle) <= margin))) <= max_violations
+
+def window_mean(values, lo, hi):
+    """
+  This function returns the mean of values[lo:hi] skipping NaN, computed the same way as pandas' Series.mean().
+  """
+    segment = values[lo:hi]
+    if segment.dtype.kind != "f":
+        return segment.sum(dtype=np.float64) / len(segment)
+    mask = np.isnan(segment)
+    count = len(segment) - mask.sum()
+    if mask.any():
+        segment = np.where(mask, 0, segment)
+    return segment.sum(dtype=np.float64) / count if count else np.nan
+
+def find_next_candidate(candidates, idx):
+    """
+  This function returns the first row at or after idx whose candidates mask is set (or the length of the mask).
+  The mask is scanned in growing chunks, so that no index array of all candidates is allocated and only the scanned
+  pages of a memory-mapped mask are read.
+  """
+    chunk_rows = MIN_SCAN_ROWS
+    while idx < len(candidates):
+        chunk = candidates[idx:idx + chunk_rows]
+        position = int(np.argmax(chunk))
+        if chunk[position]:
+            return idx + position
+        idx += len(chunk)
+        chunk_rows = min(2 * chunk_rows, MAX_SCAN_ROWS)
+    return len(candidates)
+
+def scan_operational_points(times, columns, mean_values, margins, time_window, candidates=None, pyramids=None):
+    """
+  This function runs the window logic of find_operational_points on arrays: the sorted int64 timestamps and
+  {column: values} (in memory or memory-mapped). The windows are located with binary searches and the margins are
+  checked coarse-to-fine with the min/max pyramids, so the rows are visited in order and only the pages of the
+  visited windows are read. It returns the rows of the operational points and their mean values.
+  """
+    half_window = (pd.Timedelta(minutes=time_window) / 2).value
+    if pyramids is None:
+        pyramids = {rule["column"]: (columns[rule["column"]], build_pyramid(columns[rule["column"]])) for rule in margins}
+    mean_columns = [col for col in mean_values if col in columns]
+    with_pelnet = "pelconsumep" in mean_values
+
+    rows = []
+    additional_info = []
+
+    # calculate the proper start index
+    idx = int(np.searchsorted(times, times[0] + half_window, side="left"))
+
+    while idx < len(times):
+        # only visit the rows that survived the steady-state pre-pass
+        if candidates is not None and not candidates[idx]:
+            idx = find_next_candidate(candidates, idx)
+            continue
+
+        # split the window into before [t - half, t) and after (t, t + half]
+        current_time = times[idx]
+        before_lo = np.searchsorted(times, current_time - half_window, side="left")
+        before_hi = np.searchsorted(times, current_time, side="left")
+        after_lo = np.searchsorted(times, current_time, side="right")
+        after_hi = np.searchsorted(times, current_time + half_window, side="right")
+
+        if before_lo == before_hi or after_lo == after_hi:
+            idx += 1
+            continue
+
+        # check margins for before and after windows
+        conditions_met = True
+        for rule in margins:
+            values, pyramid = pyramids[rule["column"]]
+            middle = values[idx]
+            before_allowed = get_allowed_violations(rule, before_hi - before_lo)
+            after_allowed = get_allowed_violations(rule, after_hi - after_lo)
+            if not (check_within_margin(values, pyramid, before_lo, before_hi, middle, rule["margin"], before_allowed) and
+                    check_within_margin(values, pyramid, after_lo, after_hi, middle, rule["margin"], after_allowed)):
+                conditions_met = False
+                break
+
+        if not conditions_met:
+            idx += 1
+            continue
+
+        rows.append(idx)
+        logging.info(f"Operational point identified at {pd.Timestamp(int(current_time))}.")
+
+        # calculate mean values for the window [t - half, t + half]
+        mean_values_dict = {col: round(window_mean(columns[col], before_lo, after_hi), 1) for col in mean_columns}
+        if with_pelnet:
+            pelnet = columns["pelgrossep"][before_lo:after_hi] - columns["pelconsumep"][before_lo:after_hi]
+            mean_values_dict["pelnet"] = round(window_mean(pelnet, 0, len(pelnet)), 1)
+        additional_info.append(mean_values_dict)
+
+        # skip half a window to avoid overlapping operational points
+        next_time = current_time + half_window
+        if next_time > times[-1]:
+            break
+        idx = int(np.searchsorted(times, next_time, side="left"))
+
+    return rows, additional_info
+
+def find_operational_points_multires(data, time_col, mean_values, config, candidates=None, pyramids=None):
+    """
+  This function identifies operational points exactly like find_operational_points, but it locates the windows with
+  binary searches on the sorted timestamps and checks the margins coarse-to-fine with the min/max pyramids.
+  If a candidates mask is given (see core.steady_state), rows that cannot pass the margin check are skipped.
+  """
+    try:
+        margins = config.get("margins", [])
+        if pyramids is None:
+            pyramids = build_margin_pyramids(data, margins)
+
+        logging.info("-" * 50)
+        logging.info("Starting coarse-to-fine analysis of operational points.")
+        logging.info("-" * 50)
+
+        times = data[time_col].values.astype("datetime64[ns]").view("int64")
+        columns = {col: data[col].values for col in mean_values if col != time_col}
+        if "pelconsumep" in mean_values:
+            columns["pelgrossep"] = data["pelgrossep"].values
+
+        rows, mean_values_dicts = scan_operational_points(
+            times, columns, mean_values, margins, config["time_window"], candidates, pyramids
+        )
+        operational_points = [data[time_col].iloc[row] for row in rows]
+        additional_info = [{time_col: point, **means} for point, means in zip(operational_points, mean_values_dicts)]
+
+        logging.info("Finished coarse-to-fine analysis of operational points.")
+        logging.info(f"Total operational points identified: {len(operational_points)}")
+        logging.info("-" * 50)
+
+        return pd.DataFrame({"Operational Points": operational_points}), pd.DataFrame(additional_info)
+
+    except Exception as e:
+        log_and_raise_error(f"An error occurred while finding operational points: {e}")
+
+def get_time_windows(config):
+    """
+  This function returns the configured time windows as a list (time_window can be a single window or a list).
+  """
+    time_window = config["time_window"]
+    return list(time_window) if isinstance(time_window, (list, tuple)) else [time_window]
+
+def find_operational_points_for_windows(data, time_col, mean_values, config, pyramids=None):
+    """
+  This function identifies the operational points for every configured time window of one data load: the min/max
+  pyramids are built once and shared by all windows, while the steady-state score (rolling min/max in O(n) memory)
+  and the scan run once per window. It returns {time_window: (op_points_df, additional_info_df, score, candidates)}.
+  """
+    time_windows = get_time_windows(config)
+    margins = config.get("margins", [])
+    if pyramids is None:
+        pyramids = build_margin_pyramids(data, margins)
+
+    results = {}
+    for time_window in time_windows:
+        window_config = {**config, "time_window": time_window}
+        score, candidates = compute_steady_state_score(data, time_col, margins, time_window)
+        op_points_df, additional_info_df = find_operational_points_multires(
+            data, time_col, mean_values, window_config, candidates, pyramids
+        )
+        results[time_window] = (op_points_df, additional_info_df, score, candidates)
+    return results
+
+def find_operational_points_for_columns(times, columns, time_col, mean_values, config, time_unit="ns"):
+    """
+  This function identifies the operational points for every configured time window like
+  find_operational_points_for_windows, but on column arrays instead of a DataFrame: the sorted int64 timestamps
+  (in ns) and {column: values}, e.g. memory-mapped .npy files larger than the memory. The candidates are computed
+  chunk by chunk and the pyramids are read sequentially, so only the aggregates are kept in memory. The steady-state
+  score is not computed (there is no filtered data to add it to). The timestamps of the results get the given unit.
+  It returns {time_window: (op_points_df, additional_info_df, None, candidates)}.
+  """
+    try:
+        margins = config.get("margins", [])
+        for column in [rule["column"] for rule in margins] + [col for col in mean_values if col != time_col]:
+            if column not in columns:
+                log_and_raise_error(f"Column '{column}' is not in the data.")
+        pyramids = {rule["column"]: (columns[rule["column"]], build_pyramid(columns[rule["column"]])) for rule in margins}
+
+        results = {}
+        for time_window in get_time_windows(config):
+            candidates = compute_candidates_in_chunks(times, columns, margins, time_window)
+
+            logging.info("-" * 50)
+            logging.info("Starting coarse-to-fine analysis of operational points.")
+            logging.info("-" * 50)
+            rows, mean_values_dicts = scan_operational_points(
+                times, columns, mean_values, margins, time_window, candidates, pyramids
+            )
+            operational_points = [pd.Timestamp(int(times[row])).as_unit(time_unit) for row in rows]
+            additional_info = [{time_col: point, **means} for point, means in zip(operational_points, mean_values_dicts)]
+            logging.info("Finished coarse-to-fine analysis of operational points.")
+            logging.info(f"Total operational points identified: {len(operational_points)}")
+            logging.info("-" * 50)
+
+            results[time_window] = (
+                pd.DataFrame({"Operational Points": operational_points}), pd.DataFrame(additional_info), None, candidates
+            )
+        return results
+
+    except Exception as e:
+        log_and_raise_error(f"An error occurred while finding operational points: {e}")
@@ -1,15 +1,20 @@
-import os
-import sys
 import logging
+import numpy as np
 import pandas as pd
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.logging_setup import log_and_raise_error
 
-def find_operational_points(data, time_col, mean_values, config):
+def get_allowed_violations(rule, window_length):
+    """
+  This function returns how many samples of a (before or after) window may be outside the margin of a margin rule:
+  the floor of its max_violation_fraction times the number of samples in the window (0 for a strict margin).
+  """
+    return int(rule.get("max_violation_fraction", 0) * window_length)
+
+def find_operational_points(data, time_col, mean_values, config, candidates=None):
     """
   This function identifies operational points in a preprocessed df based on a dynamic config.
   It returns the operational points and their mean values (according to the specified time window).
+  If a candidates mask is given (see core.steady_state), rows that cannot pass the margin check are skipped.
   """
     try:
         # extract configuration values
@@ -31,7 +36,17 @@ def find_operational_points(data, time_col, mean_values, config):
             start_row = data[data[time_col] > start_time].iloc[0:1]
         idx = start_row.index[0]
 
+        # only visit the rows that survived the steady-state pre-pass
+        candidate_rows = np.flatnonzero(candidates) if candidates is not None else None
+
         while idx < len(data):
+            if candidate_rows is not None and not candidates[idx]:
+                next_candidate = np.searchsorted(candidate_rows, idx)
+                if next_candidate == len(candidate_rows):
+                    break
+                idx = int(candidate_rows[next_candidate])
+                continue
+
             row = data.iloc[idx]
             current_time = row[time_col]
             logging.info(f"Processing row {idx + 2} with current time: {current_time}")
@@ -63,15 +78,17 @@ def find_operational_points(data, time_col, mean_values, config):
                 if column not in data.columns:
                     log_and_raise_error(f"Column '{column}' defined in margins is not in the data.")
 
-                # check before window
-                before_within_margin = all(abs(before_window[column] - middle_values[column]) <= margin)
+                # check before window (up to the allowed number of samples may be outside the margin)
+                before_violations = (~(abs(before_window[column] - middle_values[column]) <= margin)).sum()
+                before_within_margin = before_violations <= get_allowed_violations(rule, len(before_window))
                 if not before_within_margin:
                     logging.info(f"Condition failed for column '{column}' in before window.")
                     conditions_met = False
                     break
 
                 # check after window
-                after_within_margin = all(abs(after_window[column] - middle_values[column]) <= margin)
+                after_violations = (~(abs(after_window[column] - middle_values[column]) <= margin)).sum()
+                after_within_margin = after_violations <= get_allowed_violations(rule, len(after_window))
                 if not after_within_margin:
                     logging.info(f"Condition failed for column '{column}' in after window.")
                     conditions_met = False
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import ttkbootstrap as ttkb
+from ttkbootstrap.constants import *
+from matplotlib.figure import Figure
+from matplotlib.dates import date2num
+from matplotlib.collections import PolyCollection
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from config.config_loader import get_profile_configs
+from utils.downsample import get_visible_range, minmax_downsample, lttb_downsample
+
+# downsampling methods that can be selected in the results view
+DOWNSAMPLING_METHODS = ("Min/Max per pixel", "LTTB")
+
+# number of buckets used until the plot size is known
+DEFAULT_BUCKETS = 1000
+
+def get_preview_sets(config, filtered_data, op_points):
+    """
+  This function returns one preview entry per profile and time window of a run: its label, filtered data,
+  operational points, time window and margin columns.
+  """
+    if config["profiles"]:
+        profiles = [(name, profile_config) for name, profile_config, _, _ in get_profile_configs(config)]
+    else:
+        profiles = [(None, config)]
+
+    preview_sets = []
+    for name, profile_config in profiles:
+        data = filtered_data[name] if name is not None else filtered_data
+        points = op_points[name] if name is not None else op_points
+        if not isinstance(points, dict):
+            points = {profile_config["time_window"]: points}
+        for time_window, op_points_df in points.items():
+            preview_sets.append({
+                "label": " / ".join(part for part in (name, f"{time_window} min") if part),
+                "data": data,
+                "op_points": op_points_df,
+                "time_window": time_window,
+                "columns": list(dict.fromkeys(rule["column"].lower() for rule in profile_config["margins"]))
+            })
+    return preview_sets
+
+class ResultsView(ttkb.Toplevel):
+    def __init__(self, master, time_col, preview_sets):
+        """
+      This method initializes the results window, which plots the margin columns of the filtered data (kept in memory)
+      with the windows of the detected operational points highlighted.
+      """
+        super().__init__(master)
+        self.title("Operational Points Preview")
+        self.geometry("1100x750")
+
+        self.time_col = time_col
+        self.preview_sets = preview_sets
+        self.preview_set = ttkb.StringVar(value=preview_sets[0]["label"])
+        self.method = ttkb.StringVar(value=DOWNSAMPLING_METHODS[0])
+        self.redraw_pending = False
+
+        self.create_widgets()
+        self.show_preview_set()
+
+    def create_widgets(self):
+        """
+      This method creates the selection widgets, the plot and its zoom/pan toolbar.
+      """
+        control_frame = ttkb.Frame(self)
+        control_frame.pack(fill="x", padx=10, pady=5)
+
+        ttkb.Label(control_frame, text="Results").pack(side="left", padx=5)
+        results_box = ttkb.Combobox(control_frame, textvariable=self.preview_set, state="readonly", width=30,
+                                    values=[preview_set["label"] for preview_set in self.preview_sets])
+        results_box.pack(side="left", padx=5)
+        results_box.bind("<<ComboboxSelected>>", lambda event: self.show_preview_set())
+
+        ttkb.Label(control_frame, text="Downsampling").pack(side="left", padx=5)
+        method_box = ttkb.Combobox(control_frame, textvariable=self.method, state="readonly", width=20,
+                                   values=DOWNSAMPLING_METHODS)
+        method_box.pack(side="left", padx=5)
+        method_box.bind("<<ComboboxSelected>>", lambda event: self.redraw())
+
+        self.info_label = ttkb.Label(control_frame, text="")
+        self.info_label.pack(side="left", padx=10)
+
+        self.figure = Figure(figsize=(11, 7), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        toolbar = NavigationToolbar2Tk(self.canvas, self, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+
+    def show_preview_set(self):
+        """
+      This method plots the selected profile and time window: one subplot per margin column (sharing the time axis),
+      with the windows of the operational points as shaded spans.
+      """
+        preview_set = next(item for item in self.preview_sets if item["label"] == self.preview_set.get())
+        data = preview_set["data"]
+        self.x = date2num(data[self.time_col].values)
+        self.series = [(column, data[column].to_numpy(dtype=float)) for column in preview_set["columns"]]
+
+        # windows of the operational points [t - half, t + half]
+        half_window = pd.Timedelta(minutes=preview_set["time_window"]) / 2
+        op_times = pd.to_datetime(preview_set["op_points"]["Operational Points"]) \
+            if not preview_set["op_points"].empty else pd.Series([], dtype="datetime64[ns]")
+        starts, ends = date2num((op_times - half_window).values), date2num((op_times + half_window).values)
+
+        self.figure.clear()
+        self.lines = []
+        axes = self.figure.subplots(len(self.series), 1, sharex=True, squeeze=False)[:, 0]
+        for ax, (column, values) in zip(axes, self.series):
+            line, = ax.plot([], [], linewidth=0.8)
+            self.lines.append(line)
+            ax.add_collection(PolyCollection(
+                [[(start, 0), (start, 1), (end, 1), (end, 0)] for start, end in zip(starts, ends)],
+                transform=ax.get_xaxis_transform(), facecolor="tab:green", edgecolor="tab:green", alpha=0.25
+            ))
+            ax.set_ylabel(column)
+            if not np.isnan(values).all():
+                low, high = np.nanmin(values), np.nanmax(values)
+                padding = (high - low) * 0.05 or 1
+                ax.set_ylim(low - padding, high + padding)
+            ax.grid(True, alpha=0.3)
+        axes[-1].xaxis_date()
+        self.figure.autofmt_xdate()
+
+        self.axes = axes
+        if len(self.x):
+            axes[0].set_xlim(self.x[0], self.x[-1])
+        axes[0].callbacks.connect("xlim_changed", lambda ax: self.schedule_redraw())
+        self.info_label.configure(text=f"{len(preview_set['op_points'])} operational points, {len(self.x)} rows")
+        self.redraw()
+
+    def schedule_redraw(self):
+        """
+      This method re-downsamples the visible range once the zoom or pan is done (not on every intermediate limit).
+      """
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.after_idle(self.redraw)
+
+    def redraw(self):
+        """
+      This method downsamples the visible range of every signal to about one bucket per pixel column and updates
+      the lines, so that zooming and panning over millions of rows stays interactive.
+      """
+        self.redraw_pending = False
+        if not len(self.x):
+            return
+        lo, hi = get_visible_range(self.x, *self.axes[0].get_xlim())
+        buckets = self.canvas.get_tk_widget().winfo_width()
+        buckets = buckets if buckets > 1 else DEFAULT_BUCKETS
+
+        for line, (_, values) in zip(self.lines, self.series):
+            if self.method.get() == "LTTB":
+                indices = lttb_downsample(self.x, values, 2 * buckets, lo, hi)
+            else:
+                indices = minmax_downsample(values, buckets, lo, hi)
+            line.set_data(self.x[indices], values[indices])
+        self.canvas.draw_idle()
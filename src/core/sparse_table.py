@@ -0,0 +1,30 @@
+import numpy as np
+
+def build_sparse_table(values, max_length, reducer):
+    """
+  This function builds a sparse table for range queries with an idempotent reducer (np.minimum or np.maximum).
+  Level k holds the reduction over values[i:i + 2**k], levels are built up to the longest range to be queried,
+  so that any range of at most max_length samples is answered in O(1), whatever the window size.
+  """
+    levels = [np.asarray(values, dtype=float)]
+    span = 1
+    while 2 * span <= max_length:
+        previous = levels[-1]
+        levels.append(reducer(previous[:-span], previous[span:]))
+        span *= 2
+    return levels
+
+def query_sparse_table(levels, lo, hi, reducer):
+    """
+  This function returns the reduction over values[lo:hi] for arrays of (non-empty) ranges, as the reduction of the
+  two overlapping power-of-two blocks that cover each range. It is vectorized per level.
+  """
+    lo = np.asarray(lo, dtype=np.int64)
+    hi = np.asarray(hi, dtype=np.int64)
+    level_of_range = np.floor(np.log2(hi - lo)).astype(np.int64)
+    result = np.empty(len(lo))
+    for level in np.unique(level_of_range):
+        selected = level_of_range == level
+        table = levels[level]
+        result[selected] = reducer(table[lo[selected]], table[hi[selected] - (1 << level)])
+    return result
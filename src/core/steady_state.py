@@ -0,0 +1,135 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+from core.sparse_table import build_sparse_table, query_sparse_table
+
+# name of the optional score column added to the filtered data
+SCORE_COLUMN = "steady_state_score"
+
+# number of rows per chunk of the chunked pre-pass (for memory-mapped columns)
+CHUNK_ROWS = 500000
+
+def get_window_bounds(times, time_window):
+    """
+  This function returns, for every row, the index range [lo, hi) of the full time window [t - half, t + half],
+  using binary searches on the sorted int64 timestamps.
+  """
+    half_window = (pd.Timedelta(minutes=time_window) / 2).value
+    lo = np.searchsorted(times, times - half_window, side="left")
+    hi = np.searchsorted(times, times + half_window, side="right")
+    return lo, hi
+
+def get_window_extremes(times, values, time_window):
+    """
+  This function returns, for every row, the min and max of the values within the full time window [t - half, t + half]
+  (NaN if the window contains a NaN value), from the sorted int64 timestamps. Both halves are time-based rolling
+  windows that end at the row, the backward half directly and the forward half on mirrored timestamps, so the memory
+  use is O(n) whatever the window size.
+  """
+    if not len(times):
+        return values.copy(), values.copy()
+    half_window = pd.Timedelta(minutes=time_window) / 2
+    backward_index = pd.DatetimeIndex(times.view("datetime64[ns]"))
+    forward_index = pd.DatetimeIndex((times[-1] - times + times[0])[::-1].view("datetime64[ns]"))
+
+    def rolling(method, window_values):
+        backward = getattr(pd.Series(window_values, index=backward_index).rolling(half_window, closed="both"), method)()
+        forward = getattr(pd.Series(window_values[::-1], index=forward_index).rolling(half_window, closed="both"), method)()
+        return backward.values, forward.values[::-1]
+
+    window_min = np.fmin(*rolling("min", values))
+    window_max = np.fmax(*rolling("max", values))
+
+    # rolling min/max skip NaN values, but a NaN sample fails the margin check of every window that contains it
+    backward_nan, forward_nan = rolling("sum", np.isnan(values).astype(float))
+    has_nan = (backward_nan > 0.5) | (forward_nan > 0.5)
+    window_min[has_nan] = np.nan
+    window_max[has_nan] = np.nan
+    return window_min, window_max
+
+def compute_steady_state_score(data, time_col, margins, time_window):
+    """
+  This function computes a cheap per-row stability score: for every margin column the largest deviation from the
+  row's value within the full time window divided by the margin, and the maximum over all margin columns.
+  A row can only be an operational point if its score is <= 1 (for the strict margins, tolerant margins with a
+  max_violation_fraction are not used to skip rows). It returns the score and a boolean mask of the rows
+  that can still pass (None if the timestamps are not strictly increasing, then no rows can be safely skipped).
+  """
+    times = data[time_col].values.astype("datetime64[ns]").view("int64")
+    score = np.zeros(len(data))
+    candidates = np.ones(len(data), dtype=bool)
+
+    for rule in margins:
+        column = rule["column"]
+        margin = rule["margin"]
+        if column not in data.columns:
+            log_and_raise_error(f"Column '{column}' defined in margins is not in the data.")
+
+        values = data[column].values.astype(float)
+        window_min, window_max = get_window_extremes(times, values, time_window)
+        deviation = np.maximum(window_max - values, values - window_min)
+
+        # NaN propagates into the deviation, such rows can never pass the margin check
+        score = np.maximum(score, deviation / margin)
+
+        # with a tolerant margin, some samples may be outside of it, so rows cannot be skipped on this column
+        if not rule.get("max_violation_fraction"):
+            candidates &= deviation <= margin
+
+    score = pd.Series(score, index=data.index, name=SCORE_COLUMN)
+
+    # with duplicated timestamps the reference windows exclude samples that the full window includes,
+    # so the mask is only exact (and used to skip rows) for strictly increasing timestamps
+    if np.any(np.diff(times) <= 0):
+        logging.info("Steady-state pre-pass: Timestamps are not strictly increasing, no rows will be skipped.")
+        return score, None
+
+    logging.info(f"Steady-state pre-pass ({time_window} min): {int(candidates.sum())} of {len(data)} rows "
+                 f"can be operational points.")
+    return score, candidates
+
+def is_strictly_increasing(times):
+    """
+  This function checks chunk by chunk if the int64 timestamps are strictly increasing.
+  """
+    for start in range(0, len(times), CHUNK_ROWS):
+        if np.any(np.diff(times[start:start + CHUNK_ROWS + 1]) <= 0):
+            return False
+    return True
+
+def compute_candidates_in_chunks(times, columns, margins, time_window):
+    """
+  This function computes the candidates mask of compute_steady_state_score chunk by chunk, for columns that do not
+  fit into memory (e.g. memory-mapped .npy files): the sparse tables only cover the rows of a chunk and of their
+  windows, so the memory use does not grow with the number of rows (apart from the mask). It returns None if the
+  timestamps are not strictly increasing, like compute_steady_state_score.
+  """
+    if not is_strictly_increasing(times):
+        logging.info("Steady-state pre-pass: Timestamps are not strictly increasing, no rows will be skipped.")
+        return None
+
+    half_window = (pd.Timedelta(minutes=time_window) / 2).value
+    strict_margins = [rule for rule in margins if not rule.get("max_violation_fraction")]
+    candidates = np.ones(len(times), dtype=bool)
+
+    for start in range(0, len(times), CHUNK_ROWS):
+        chunk_times = np.asarray(times[start:start + CHUNK_ROWS])
+        lo = np.searchsorted(times, chunk_times - half_window, side="left")
+        hi = np.searchsorted(times, chunk_times + half_window, side="right")
+        first, last = int(lo[0]), int(hi[-1])
+        max_length = int((hi - lo).max())
+
+        for rule in strict_margins:
+            values = np.asarray(columns[rule["column"]][first:last], dtype=float)
+            window_min = query_sparse_table(build_sparse_table(values, max_length, np.minimum),
+                                            lo - first, hi - first, np.minimum)
+            window_max = query_sparse_table(build_sparse_table(values, max_length, np.maximum),
+                                            lo - first, hi - first, np.maximum)
+            row_values = values[start - first:start - first + len(chunk_times)]
+            deviation = np.maximum(window_max - row_values, row_values - window_min)
+            candidates[start:start + len(chunk_times)] &= deviation <= rule["margin"]
+
+    logging.info(f"Steady-state pre-pass ({time_window} min): {int(candidates.sum())} of {len(times)} rows "
+                 f"can be operational points.")
+    return candidates
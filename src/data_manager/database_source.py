@@ -0,0 +1,147 @@
+import os
+import logging
+import sqlite3
+from datetime import datetime
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+
+# file extensions of the supported embedded databases
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+DUCKDB_EXTENSIONS = (".duckdb",)
+
+# number of rows fetched per batch
+BATCH_ROWS = 100000
+
+def get_database_type(input_file):
+    """
+  This function returns "sqlite" or "duckdb" if the input file is an embedded database, or None otherwise.
+  """
+    if not isinstance(input_file, str):
+        return None
+    extension = os.path.splitext(input_file)[1].lower()
+    if extension in SQLITE_EXTENSIONS:
+        return "sqlite"
+    if extension in DUCKDB_EXTENSIONS:
+        return "duckdb"
+    return None
+
+def quote_identifier(name):
+    """
+  This function quotes a table or column name for SQL.
+  """
+    return '"' + name.replace('"', '""') + '"'
+
+def connect_database(input_file, database_type):
+    """
+  This function opens a read-only connection to the SQLite or DuckDB file (duckdb is imported lazily).
+  It returns the connection and the base class of the database's errors.
+  """
+    if not os.path.exists(input_file):
+        log_and_raise_error("The specified file was not found. Please check the file path.")
+    if database_type == "sqlite":
+        return sqlite3.connect(f"file:{input_file}?mode=ro", uri=True), sqlite3.Error
+    try:
+        import duckdb
+    except ImportError:
+        log_and_raise_error("DuckDB input files require 'duckdb'. Please install it with 'pip install duckdb'.")
+    return duckdb.connect(input_file, read_only=True), duckdb.Error
+
+def build_query(source, database_type, column_names, time_col, needed_columns, conditions, row_to_remove,
+                time_range=None):
+    """
+  This function translates the time column, the needed columns, row_to_remove, the "equals" conditions and the time
+  range into a single SQL query on the table or query (source), ordered by time. Column names are matched case
+  insensitively, like the lowercase column names of the file inputs. It returns the query and its parameters.
+  """
+    columns = {name.lower(): name for name in column_names}
+    if time_col not in columns:
+        log_and_raise_error("'time' column is missing in the input file.")
+    all_columns = [time_col] + needed_columns
+    missing_columns = [col for col in all_columns if col not in columns]
+    if missing_columns:
+        log_and_raise_error(f"The following columns are missing: {', '.join(missing_columns)}")
+
+    # SQLite stores timestamps as ISO text (compared as strings), DuckDB columns are cast to TIMESTAMP
+    time_expression = quote_identifier(columns[time_col])
+    if database_type == "duckdb":
+        time_expression = f"CAST({time_expression} AS TIMESTAMP)"
+    def time_parameter(value):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f").rstrip("0").rstrip(".") if database_type == "sqlite" else value
+
+    where, parameters = [], []
+    if row_to_remove:
+        try:
+            time_to_remove = datetime.strptime(row_to_remove, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            log_and_raise_error(f"Invalid datetime format for 'row_to_remove': {row_to_remove}. Expected format: 'YYYY-MM-DD HH:MM:SS'")
+        where.append(f"{time_expression} <> ?")
+        parameters.append(time_parameter(time_to_remove))
+
+    for column, value in {col.lower(): value for col, value in conditions.items()}.items():
+        if column not in all_columns:
+            log_and_raise_error(f"Column '{column}' not found in the data.")
+        if not isinstance(value, int):
+            log_and_raise_error(f"Condition for column '{column}' has an invalid value type: Expected an int, got {type(value).__name__}")
+        where.append(f"{quote_identifier(columns[column])} = ?")
+        parameters.append(value)
+
+    if time_range is not None:
+        start, end = time_range
+        if start is not None:
+            where.append(f"{time_expression} >= ?")
+            parameters.append(time_parameter(start.to_pydatetime()))
+        if end is not None:
+            where.append(f"{time_expression} <= ?")
+            parameters.append(time_parameter(end.to_pydatetime()))
+
+    select = ", ".join(f"{quote_identifier(columns[col])} AS {quote_identifier(col)}" for col in all_columns)
+    query = f"SELECT {select} FROM {source}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += f" ORDER BY {time_expression}"
+    return query, parameters
+
+def load_database_data(input_file, time_col, needed_columns, conditions, row_to_remove, table=None, query=None,
+                       time_range=None):
+    """
+  This function loads the data of a table (or of the result of a query) of a SQLite or DuckDB file, with the
+  filtering done by the database: only the matching rows and the needed columns are fetched, in time order and in
+  batches (Arrow record batches for DuckDB). It returns the same data as load_parse_data followed by filter_data.
+  """
+    database_type = get_database_type(input_file)
+    if database_type is None:
+        log_and_raise_error("Unsupported database file. Please select a SQLite (.db, .sqlite) or DuckDB (.duckdb) file.")
+    if not table and not query:
+        log_and_raise_error("A database input requires a 'table' or a 'query' in the config.")
+    source = quote_identifier(table) if table else f"({query}) AS source"
+
+    connection, database_error = connect_database(input_file, database_type)
+    try:
+        column_names = [column[0] for column in connection.execute(f"SELECT * FROM {source} LIMIT 0").description]
+        sql, parameters = build_query(source, database_type, column_names, time_col, needed_columns, conditions,
+                                      row_to_remove, time_range)
+        logging.info(f"Database input: Running query on {input_file}: {sql}")
+
+        result = connection.execute(sql, parameters)
+        if database_type == "duckdb":
+            batches = [batch.to_pandas() for batch in result.to_arrow_reader(BATCH_ROWS)]
+        else:
+            columns = [column[0] for column in result.description]
+            batches = []
+            while True:
+                rows = result.fetchmany(BATCH_ROWS)
+                if not rows:
+                    break
+                batches.append(pd.DataFrame.from_records(rows, columns=columns))
+    except database_error as e:
+        log_and_raise_error(f"Database query failed: {e}")
+    finally:
+        connection.close()
+
+    data = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=[time_col] + needed_columns)
+    data[time_col] = pd.to_datetime(data[time_col])
+    logging.info(f"Database input: Loaded {len(data)} rows in {len(batches)} batches.")
+
+    if data.empty:
+        log_and_raise_error("Filtered data is empty. No CSV file will be saved.")
+    return data
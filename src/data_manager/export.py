@@ -0,0 +1,40 @@
+import logging
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+
+def write_ndjson(additional_info_df, stream):
+    """
+  This function writes the operational points with their mean values as newline-delimited JSON (one point per line).
+  """
+    if not additional_info_df.empty:
+        stream.write(additional_info_df.to_json(orient="records", lines=True, date_format="iso").rstrip("\n") + "\n")
+    stream.flush()
+    logging.info(f"Export: Wrote {len(additional_info_df)} operational points as NDJSON.")
+
+def write_arrow_ipc(additional_info_df, stream):
+    """
+  This function writes the operational points with their mean values as an Arrow IPC stream to a binary stream.
+  """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        log_and_raise_error("The Arrow output format requires 'pyarrow'. Please install it with 'pip install pyarrow'.")
+
+    table = pa.Table.from_pandas(additional_info_df, preserve_index=False)
+    with pa.ipc.new_stream(stream, table.schema) as writer:
+        writer.write_table(table)
+    stream.flush()
+    logging.info(f"Export: Wrote {len(additional_info_df)} operational points as Arrow IPC stream.")
+
+def flatten_results(results):
+    """
+  This function flattens per-profile and/or per-window results ({profile: {time_window: df}}, {time_window: df})
+  into one DataFrame with "profile" and "time_window" columns.
+  """
+    if not isinstance(results, dict):
+        return results
+    frames = []
+    for key, value in results.items():
+        column = "profile" if isinstance(key, str) else "time_window"
+        frames.append(flatten_results(value).assign(**{column: key}))
+    return pd.concat(frames, ignore_index=True)
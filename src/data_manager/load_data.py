@@ -1,18 +1,26 @@
-import os
-import sys
 import logging
 import pandas as pd
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.logging_setup import log_and_raise_error
+from data_manager.time_index import read_time_range
 
-def load_parse_data(input_file, time_col):
+def load_parse_data(input_file, time_col, time_range=None, use_time_index=True):
     """
-  This function loads data from a CSV or Excel file, parses the "time" column as datetime, sort by the "time" column.
+  This function loads data from a CSV or Excel file (or a file object with CSV data), parses the "time" column as
+  datetime, sort by the "time" column.
+  If a time range (start, end) is given, only the rows within it are kept. For CSV files sorted by time, a sidecar
+  time index is used to parse only the part of the file around the range.
   """
     try:
-        if input_file.endswith(".csv"):
+        data = None
+        if not isinstance(input_file, str):
+            # an already opened file object (e.g. stdin), it is expected to contain CSV data
             data = pd.read_csv(input_file)
+            logging.info("CSV data was loaded successfully from the input stream.")
+        elif input_file.endswith(".csv"):
+            if time_range is not None and use_time_index:
+                data = read_time_range(input_file, time_col, *time_range)
+            if data is None:
+                data = pd.read_csv(input_file)
             logging.info("CSV file was loaded successfully.")
         elif input_file.endswith(".xlsx"):
             data = pd.read_excel(input_file)
@@ -28,8 +36,20 @@ def load_parse_data(input_file, time_col):
             log_and_raise_error("'time' column is missing in the input file.")
         data[time_col] = pd.to_datetime(data[time_col])
 
-        # sort the data by the "time" column
-        data = data.sort_values(by=time_col).reset_index(drop=True)
+        # keep only the rows within the time range
+        if time_range is not None:
+            start, end = time_range
+            in_range = pd.Series(True, index=data.index)
+            if start is not None:
+                in_range &= data[time_col] >= start
+            if end is not None:
+                in_range &= data[time_col] <= end
+            data = data[in_range]
+            logging.info(f"{len(data)} rows within the time range {start} - {end}.")
+
+        # sort the data by the "time" column (stable, so that rows with the same timestamp keep their file order
+        # like with the other backends)
+        data = data.sort_values(by=time_col, kind="stable").reset_index(drop=True)
 
         if data is None or data.empty:
             log_and_raise_error("Empty data after loading from the input file.")
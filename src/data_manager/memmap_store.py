@@ -0,0 +1,234 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from version import __version__
+from utils.logging_setup import log_and_raise_error
+from data_manager.result_cache import get_input_fingerprint
+
+MANIFEST_FILE = "manifest.json"
+TIME_FILE = "time.npy"
+
+# number of CSV rows parsed per chunk while converting an input file
+CHUNK_ROWS = 1000000
+
+def get_filter_hash(time_col, conditions, row_to_remove, time_range):
+    """
+  This function returns a short hash of everything that selects the rows of a store (the time column, the
+  conditions, row_to_remove and the time range), so that a store is only reused for the same filtering.
+  """
+    filter_data = {
+        "time_col": time_col,
+        "conditions": {col.lower(): value for col, value in conditions.items()},
+        "row_to_remove": row_to_remove,
+        "time_range": [str(bound) for bound in time_range] if time_range is not None else None
+    }
+    return hashlib.sha256(json.dumps(filter_data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def get_store_dir(memmap_dir, input_file, filter_hash):
+    """
+  This function returns the store dir of an input file and filtering (a changed input file reuses the same dir).
+  """
+    key = hashlib.sha256(f"{os.path.abspath(input_file)}|{filter_hash}".encode("utf-8")).hexdigest()[:32]
+    return os.path.join(memmap_dir, key)
+
+def load_manifest(store_dir):
+    """
+  This function loads the manifest of a store, or returns None if there is none (or it is unreadable).
+  """
+    manifest_file = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_file):
+        return None
+    try:
+        with open(manifest_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        logging.warning("Memmap store: Manifest %s is unreadable, the store will be rebuilt.", manifest_file)
+        return None
+
+def open_store(store_dir, manifest):
+    """
+  This function opens the .npy files of a store as read-only memory maps.
+  It returns the store: {"dir", "rows", "time_unit", "times", "columns": {column: values}}.
+  """
+    return {
+        "dir": store_dir,
+        "rows": manifest["rows"],
+        "time_unit": manifest["time_unit"],
+        "times": np.load(os.path.join(store_dir, TIME_FILE), mmap_mode="r"),
+        "columns": {column: np.load(os.path.join(store_dir, file_name), mmap_mode="r")
+                    for column, file_name in manifest["columns"].items()}
+    }
+
+def write_npy_header(f, dtype, rows):
+    """
+  This function writes the header of a 1-d .npy file. numpy reserves room in the header for any row count, so the
+  header of a file written chunk by chunk can be rewritten in place with the final row count.
+  """
+    f.seek(0)
+    np.lib.format.write_array_header_1_0(f, {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                                             "fortran_order": False, "shape": (rows,)})
+
+def filter_chunk(chunk, time_col, needed_columns, conditions, row_to_remove, time_range):
+    """
+  This function parses and filters one chunk of CSV rows like load_parse_data and filter_data (time range,
+  row_to_remove, needed columns and "equals" conditions), without sorting it.
+  """
+    chunk.columns = chunk.columns.str.lower()
+    all_columns = [time_col] + needed_columns
+    missing_columns = [col for col in all_columns if col not in chunk.columns]
+    if missing_columns:
+        log_and_raise_error(f"The following columns are missing: {', '.join(missing_columns)}")
+
+    chunk = chunk[all_columns]
+    chunk[time_col] = pd.to_datetime(chunk[time_col])
+    keep = pd.Series(True, index=chunk.index)
+    if time_range is not None:
+        start, end = time_range
+        if start is not None:
+            keep &= chunk[time_col] >= start
+        if end is not None:
+            keep &= chunk[time_col] <= end
+    if row_to_remove:
+        keep &= chunk[time_col] != pd.Timestamp(row_to_remove)
+    for column, value in conditions.items():
+        keep &= chunk[column] == value
+    return chunk[keep]
+
+def sort_store(tmp_dir, manifest):
+    """
+  This function sorts the files of a store by time (stable, like load_parse_data), column by column through
+  memory maps. The argsort reads the whole time column, so the timestamps and the sort order (16 bytes per row) are
+  held in memory while sorting; the columns are then reordered chunk by chunk.
+  """
+    times = np.load(os.path.join(tmp_dir, TIME_FILE), mmap_mode="r")
+    order = np.argsort(times, kind="stable")
+    del times
+    for file_name in [TIME_FILE] + list(manifest["columns"].values()):
+        path = os.path.join(tmp_dir, file_name)
+        values = np.load(path, mmap_mode="r")
+        sorted_values = np.lib.format.open_memmap(path + ".sorted", mode="w+", dtype=values.dtype, shape=values.shape)
+        for start in range(0, len(order), CHUNK_ROWS):
+            sorted_values[start:start + CHUNK_ROWS] = values[order[start:start + CHUNK_ROWS]]
+        sorted_values.flush()
+        del values, sorted_values
+        os.replace(path + ".sorted", path)
+
+def build_store(input_file, store_dir, time_col, needed_columns, conditions, row_to_remove, time_range, filter_hash):
+    """
+  This function converts the filtered rows of a CSV file into one .npy file per column (float64) and the int64
+  timestamps (ns), reading the file in chunks of CHUNK_ROWS rows, so that the memory use does not depend on the size
+  of the file. The files are written to a temporary dir and replace the previous store at the end.
+  It returns the manifest of the new store.
+  """
+    # validate the filter like filter_data, once for all chunks
+    if row_to_remove:
+        try:
+            datetime.strptime(row_to_remove, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            log_and_raise_error(f"Invalid datetime format for 'row_to_remove': {row_to_remove}. Expected format: 'YYYY-MM-DD HH:MM:SS'")
+    conditions = {col.lower(): value for col, value in conditions.items()}
+    for column, value in conditions.items():
+        if column not in [time_col] + needed_columns:
+            log_and_raise_error(f"Column '{column}' not found in the data.")
+        if not isinstance(value, int):
+            log_and_raise_error(f"Condition for column '{column}' has an invalid value type: Expected an int, got {type(value).__name__}")
+
+    tmp_dir = store_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    file_names = {column: f"column_{i}.npy" for i, column in enumerate(needed_columns)}
+    files = {column: open(os.path.join(tmp_dir, file_name), "wb") for column, file_name in file_names.items()}
+    files[time_col] = open(os.path.join(tmp_dir, TIME_FILE), "wb")
+
+    rows, time_unit, is_sorted, last_time = 0, None, True, None
+    try:
+        for f in files.values():
+            write_npy_header(f, np.float64, 0)
+        for chunk in pd.read_csv(input_file, chunksize=CHUNK_ROWS):
+            chunk = filter_chunk(chunk, time_col, needed_columns, conditions, row_to_remove, time_range)
+            if chunk.empty:
+                continue
+            time_values = chunk[time_col].values
+            time_unit = time_unit or np.datetime_data(time_values.dtype)[0]
+            times = time_values.astype("datetime64[ns]").view("int64")
+            if (last_time is not None and times[0] < last_time) or np.any(np.diff(times) < 0):
+                is_sorted = False
+            last_time = times[-1]
+
+            times.tofile(files[time_col])
+            for column in needed_columns:
+                try:
+                    chunk[column].to_numpy(dtype=np.float64).tofile(files[column])
+                except (TypeError, ValueError):
+                    log_and_raise_error(f"Column '{column}' is not numeric and cannot be memory-mapped.")
+            rows += len(chunk)
+
+        write_npy_header(files[time_col], np.int64, rows)
+        for column in needed_columns:
+            write_npy_header(files[column], np.float64, rows)
+    except FileNotFoundError:
+        log_and_raise_error("The specified file was not found. Please check the file path.")
+    except pd.errors.EmptyDataError:
+        log_and_raise_error("The file is empty. No data to process.")
+    finally:
+        for f in files.values():
+            f.close()
+
+    if rows == 0:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        log_and_raise_error("Filtered data is empty. No CSV file will be saved.")
+
+    manifest = {
+        "version": __version__,
+        "input": get_input_fingerprint(input_file),
+        "filter_hash": filter_hash,
+        "time_col": time_col,
+        "time_unit": time_unit,
+        "rows": rows,
+        "columns": file_names
+    }
+    if not is_sorted:
+        logging.info("Memmap store: Sorting the rows by time.")
+        sort_store(tmp_dir, manifest)
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f)
+
+    # replace the previous store (memory maps that are still open keep the removed files)
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+    return manifest
+
+def load_memmap_store(memmap_dir, input_file, time_col, needed_columns, conditions, row_to_remove, time_range=None):
+    """
+  This function returns the memory-mapped store of the filtered input data. The store of the same input file and
+  filtering is reused if its manifest matches the input file fingerprint and contains the needed columns, so runs
+  with other margins or time windows do not parse the file again. Otherwise the CSV file is converted once (with the
+  columns of the previous store as well, so that the store only grows).
+  """
+    if not isinstance(input_file, str) or not input_file.endswith(".csv"):
+        log_and_raise_error("The memory-mapped mode requires a CSV input file.")
+    if not os.path.exists(input_file):
+        log_and_raise_error("The specified file was not found. Please check the file path.")
+
+    filter_hash = get_filter_hash(time_col, conditions, row_to_remove, time_range)
+    store_dir = get_store_dir(memmap_dir, input_file, filter_hash)
+    manifest = load_manifest(store_dir)
+
+    if manifest is not None:
+        if manifest["version"] == __version__ and manifest["filter_hash"] == filter_hash \
+                and manifest["input"] == get_input_fingerprint(input_file) \
+                and all(column in manifest["columns"] for column in needed_columns):
+            logging.info(f"Memmap store: Reusing {store_dir} ({manifest['rows']} rows).")
+            return {**open_store(store_dir, manifest), "reused": True}
+        needed_columns = list(manifest["columns"]) + [col for col in needed_columns if col not in manifest["columns"]]
+
+    logging.info(f"Memmap store: Converting {input_file} to {store_dir}.")
+    manifest = build_store(input_file, store_dir, time_col, needed_columns, conditions, row_to_remove, time_range,
+                           filter_hash)
+    logging.info(f"Memmap store: Stored {manifest['rows']} rows of {len(needed_columns)} columns.")
+    return {**open_store(store_dir, manifest), "reused": False}
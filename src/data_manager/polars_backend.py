@@ -0,0 +1,128 @@
+import re
+import logging
+from datetime import datetime
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+
+# dataframe backends for loading and filtering the data ("pandas" is the default and reference implementation)
+BACKENDS = ("pandas", "polars")
+
+# timestamps that polars parses like pandas (ISO 8601 dates with an optional time), others are parsed with pandas
+ISO_TIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+
+# number of rows whose timestamps are checked for the ISO format
+ISO_CHECK_ROWS = 1000
+
+def import_polars():
+    """
+  This function imports polars lazily, since it is only needed when the polars backend is selected.
+  """
+    try:
+        import polars as pl
+        return pl
+    except ImportError:
+        log_and_raise_error("The polars backend requires 'polars'. Please install it with 'pip install polars'.")
+
+def is_iso_time(scan, time_col):
+    """
+  This function checks on the first rows of a scan whether the time column holds ISO 8601 timestamps, which polars
+  parses the same way as pandas. Other formats (e.g. dd.mm.yyyy) are inferred differently by both libraries.
+  """
+    pl = import_polars()
+    if scan.collect_schema()[time_col] != pl.String:
+        return False
+    values = scan.select(time_col).head(ISO_CHECK_ROWS).collect()[time_col].drop_nulls()
+    return all(ISO_TIME_PATTERN.match(value) for value in values)
+
+def parse_filter_time(data, time_col, time_to_remove, time_range):
+    """
+  This function parses the time column of the scanned data with pandas (like load_parse_data), removes the rows of
+  row_to_remove, keeps the rows within the time range and sorts the data by time.
+  """
+    data[time_col] = pd.to_datetime(data[time_col])
+    keep = pd.Series(True, index=data.index)
+    if time_to_remove is not None:
+        keep &= data[time_col] != time_to_remove
+    if time_range is not None:
+        start, end = time_range
+        if start is not None:
+            keep &= data[time_col] >= start
+        if end is not None:
+            keep &= data[time_col] <= end
+    return data[keep].sort_values(by=time_col, kind="stable").reset_index(drop=True)
+
+def scan_filter_data(input_file, time_col, needed_columns, conditions, row_to_remove, time_range=None):
+    """
+  This function loads and filters a CSV file with a polars lazy scan, and returns the same data as load_parse_data
+  followed by filter_data (pandas). Only the time column and the needed columns are parsed (projection pushdown),
+  and row_to_remove, the conditions and the time range are applied while scanning (predicate pushdown), with
+  multithreaded parsing. The result is sorted by time (rows with the same timestamp keep their file order) and
+  converted to a pandas DataFrame with contiguous NumPy columns for the detection.
+  """
+    pl = import_polars()
+
+    try:
+        scan = pl.scan_csv(input_file)
+
+        # normalize column names to lowercase
+        scan = scan.rename({column: column.lower() for column in scan.collect_schema().names()})
+        columns = scan.collect_schema().names()
+        if time_col not in columns:
+            log_and_raise_error("'time' column is missing in the input file.")
+
+        # keep only the needed columns
+        all_columns = [time_col] + needed_columns
+        missing_columns = [col for col in all_columns if col not in columns]
+        if missing_columns:
+            log_and_raise_error(f"The following columns are missing: {', '.join(missing_columns)}")
+        scan = scan.select(all_columns)
+
+        # ISO timestamps are parsed while scanning, with the resolution pandas uses for parsed strings,
+        # other formats are parsed with pandas after the scan, so that both backends give the same timestamps
+        iso_time = is_iso_time(scan, time_col)
+        if iso_time:
+            scan = scan.with_columns(pl.col(time_col).str.to_datetime(time_unit="us"))
+        else:
+            logging.info("Polars backend: The time column is not in ISO 8601 format, it is parsed with pandas.")
+
+        # remove rows with the specific value in the "time" column
+        time_to_remove = None
+        if row_to_remove:
+            try:
+                time_to_remove = datetime.strptime(row_to_remove, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                log_and_raise_error(f"Invalid datetime format for 'row_to_remove': {row_to_remove}. Expected format: 'YYYY-MM-DD HH:MM:SS'")
+            if iso_time:
+                # rows without a timestamp are kept, like with pandas (NaT != value)
+                scan = scan.filter(pl.col(time_col).ne_missing(time_to_remove))
+
+        # apply conditions (only "equals" conditions supported)
+        for column, value in {col.lower(): value for col, value in conditions.items()}.items():
+            if column not in all_columns:
+                log_and_raise_error(f"Column '{column}' not found in the data.")
+            if not isinstance(value, int):
+                log_and_raise_error(f"Condition for column '{column}' has an invalid value type: Expected an int, got {type(value).__name__}")
+            scan = scan.filter(pl.col(column) == value)
+
+        # keep only the rows within the time range
+        if time_range is not None and iso_time:
+            start, end = time_range
+            if start is not None:
+                scan = scan.filter(pl.col(time_col) >= start.to_pydatetime())
+            if end is not None:
+                scan = scan.filter(pl.col(time_col) <= end.to_pydatetime())
+
+        if iso_time:
+            data = scan.sort(time_col, maintain_order=True, nulls_last=True).collect().to_pandas()
+        else:
+            data = parse_filter_time(scan.collect().to_pandas(), time_col, time_to_remove, time_range)
+        logging.info(f"Polars backend: Loaded and filtered {len(data)} rows with the columns: {', '.join(all_columns)}.")
+
+        if data.empty:
+            log_and_raise_error("Filtered data is empty. No CSV file will be saved.")
+        return data
+
+    except FileNotFoundError:
+        log_and_raise_error("The specified file was not found. Please check the file path.")
+    except pl.exceptions.PolarsError as e:
+        log_and_raise_error(f"Polars backend error: {e}")
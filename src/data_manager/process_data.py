@@ -1,9 +1,5 @@
-import os
-import sys
 import logging
 from datetime import datetime
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.logging_setup import log_and_raise_error
 
 def filter_data(data, needed_columns, time_col, conditions, row_to_remove):
@@ -0,0 +1,143 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import pandas as pd
+from version import __version__
+from config.config_loader import get_config_hash
+
+CACHE_INDEX_FILE = "index.json"
+OP_POINTS_FILE = "op_points.pkl"
+ADDITIONAL_INFO_FILE = "op_with_mean_values.pkl"
+REPORT_FILE = "run_report.json"
+
+# serializes the read-modify-write of the index and the entries (the read and write stages of a pipeline run in
+# different threads), reentrant since the cache operations call each other
+CACHE_LOCK = threading.RLock()
+
+def get_input_fingerprint(input_file):
+    """
+  This function returns a cheap fingerprint (absolute path, size and modification time) of the input file.
+  """
+    stat = os.stat(input_file)
+    return {"path": os.path.abspath(input_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def get_cache_key(config, input_file, engine):
+    """
+  This function builds the cache key from the canonical hash of the validated config, the input file fingerprint,
+  the library version and the detection engine.
+  """
+    key_data = {
+        "config_hash": get_config_hash(config),
+        "input": get_input_fingerprint(input_file),
+        "version": __version__,
+        "engine": engine
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+def clear_cache(cache_dir):
+    """
+  This function removes all entries of the result cache.
+  """
+    with CACHE_LOCK:
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+            logging.info("Result cache: Cleared %s.", cache_dir)
+
+def load_index(cache_dir, engine):
+    """
+  This function loads the cache index. If the cache was written by another library version or engine,
+  the whole cache is invalidated.
+  """
+    index_file = os.path.join(cache_dir, CACHE_INDEX_FILE)
+    index = None
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            logging.warning("Result cache: Index %s is unreadable, the cache will be rebuilt.", index_file)
+
+    if index is not None and (index.get("version") != __version__ or index.get("engine") != engine):
+        logging.info(f"Result cache: Version or engine changed ({index.get('version')}/{index.get('engine')} -> "
+                     f"{__version__}/{engine}), invalidating the cache.")
+        clear_cache(cache_dir)
+        index = None
+
+    if index is None:
+        index = {"version": __version__, "engine": engine, "clock": 0, "entries": {}}
+    return index
+
+def save_index(cache_dir, index):
+    """
+  This function saves the cache index atomically (written to a temporary file that replaces the index), so that
+  an interrupted write never leaves a truncated index.
+  """
+    os.makedirs(cache_dir, exist_ok=True)
+    index_file = os.path.join(cache_dir, CACHE_INDEX_FILE)
+    with open(index_file + ".tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(index_file + ".tmp", index_file)
+
+def touch_entry(index, key):
+    """
+  This function marks an entry as most recently used.
+  """
+    index["clock"] += 1
+    index["entries"][key] = index["clock"]
+
+def load_cached_result(cache_dir, key, engine):
+    """
+  This function returns the cached (op_points_df, additional_info_df, report) for the key, or None on a cache miss.
+  """
+    with CACHE_LOCK:
+        index = load_index(cache_dir, engine)
+        if key not in index["entries"]:
+            logging.info("Result cache: Miss for key %s.", key)
+            return None
+
+        entry_dir = os.path.join(cache_dir, key)
+        try:
+            op_points_df = pd.read_pickle(os.path.join(entry_dir, OP_POINTS_FILE))
+            additional_info_df = pd.read_pickle(os.path.join(entry_dir, ADDITIONAL_INFO_FILE))
+            with open(os.path.join(entry_dir, REPORT_FILE), "r") as f:
+                report = json.load(f)
+        except Exception as e:
+            logging.warning(f"Result cache: Entry {key} is unreadable ({e}), ignoring it.")
+            index["entries"].pop(key, None)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            save_index(cache_dir, index)
+            return None
+
+        touch_entry(index, key)
+        save_index(cache_dir, index)
+        logging.info("Result cache: Hit for key %s.", key)
+        return op_points_df, additional_info_df, report
+
+def store_cached_result(cache_dir, key, engine, op_points_df, additional_info_df, report, max_entries):
+    """
+  This function stores a result in the cache and evicts the least recently used entries above max_entries.
+  The operational points and mean values can be DataFrames or {time_window: DataFrame} dicts.
+  """
+    with CACHE_LOCK:
+        index = load_index(cache_dir, engine)
+
+        entry_dir = os.path.join(cache_dir, key)
+        os.makedirs(entry_dir, exist_ok=True)
+        pd.to_pickle(op_points_df, os.path.join(entry_dir, OP_POINTS_FILE))
+        pd.to_pickle(additional_info_df, os.path.join(entry_dir, ADDITIONAL_INFO_FILE))
+        with open(os.path.join(entry_dir, REPORT_FILE), "w") as f:
+            json.dump(report, f, default=str)
+        touch_entry(index, key)
+
+        # evict the least recently used entries
+        while len(index["entries"]) > max_entries:
+            oldest_key = min(index["entries"], key=index["entries"].get)
+            index["entries"].pop(oldest_key)
+            shutil.rmtree(os.path.join(cache_dir, oldest_key), ignore_errors=True)
+            logging.info("Result cache: Evicted least recently used entry %s.", oldest_key)
+
+        save_index(cache_dir, index)
+        logging.info("Result cache: Stored entry %s.", key)
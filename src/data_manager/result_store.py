@@ -0,0 +1,107 @@
+import os
+import uuid
+import logging
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+
+# name of the column holding the operational point timestamps inside the store
+OP_POINT_COLUMN = "operational_point"
+PARTITION_COLUMNS = ["plant", "date"]
+DEFAULT_PLANT = "default"
+
+def import_pyarrow():
+    """
+  This function imports pyarrow lazily, since it is only needed when the result store is used.
+  """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        return pa, ds
+    except ImportError:
+        log_and_raise_error("The result store requires 'pyarrow'. Please install it with 'pip install pyarrow'.")
+
+def get_partitioning(pa, ds):
+    """
+  This function returns the hive partitioning (plant=.../date=...) used by the result store.
+  """
+    return ds.partitioning(pa.schema([("plant", pa.string()), ("date", pa.string())]), flavor="hive")
+
+def append_results(store_dir, additional_info_df, time_col, config_hash, plant=None, time_window=None, profile=None):
+    """
+  This function appends the operational points and their mean values of one run (time window and profile) to the
+  result store. Every run writes new files into the plant/date partitions, so existing results are never overwritten.
+  """
+    pa, ds = import_pyarrow()
+
+    if additional_info_df.empty:
+        logging.info("Result store: No operational points to append to %s.", store_dir)
+        return None
+
+    run_id = uuid.uuid4().hex
+    results = additional_info_df.rename(columns={time_col: OP_POINT_COLUMN})
+    results[OP_POINT_COLUMN] = pd.to_datetime(results[OP_POINT_COLUMN])
+    results["time_window"] = time_window
+    results["profile"] = profile
+    results["config_hash"] = config_hash
+    results["run_id"] = run_id
+    results["plant"] = plant or DEFAULT_PLANT
+    results["date"] = results[OP_POINT_COLUMN].dt.strftime("%Y-%m-%d")
+
+    table = pa.Table.from_pandas(results, preserve_index=False)
+    ds.write_dataset(
+        table,
+        store_dir,
+        format="parquet",
+        partitioning=get_partitioning(pa, ds),
+        basename_template=f"part-{run_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore"
+    )
+    logging.info(f"Result store: Appended {len(results)} operational points (run {run_id}) to {store_dir}.")
+    return run_id
+
+def query_results(store_dir, start=None, end=None, plant=None, value_ranges=None, columns=None):
+    """
+  This function queries the result store. The time range, plant and value ranges ({column: (min, max)}, where
+  min or max can be None) are pushed down to the Parquet reader, so only matching partitions and row groups are read.
+  """
+    pa, ds = import_pyarrow()
+
+    if not os.path.isdir(store_dir):
+        log_and_raise_error(f"Result store {store_dir} does not exist.")
+
+    # runs can store different mean value columns, so unify the schemas of all files (only the footers are read)
+    dataset = ds.dataset(store_dir, format="parquet", partitioning=get_partitioning(pa, ds))
+    fragment_schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if not fragment_schemas:
+        return pd.DataFrame()
+    schema = pa.unify_schemas(fragment_schemas + [dataset.partitioning.schema])
+    dataset = ds.dataset(store_dir, schema=schema, format="parquet", partitioning=get_partitioning(pa, ds))
+
+    time_type = schema.field(OP_POINT_COLUMN).type
+    expression = None
+    conditions = []
+    if plant:
+        conditions.append(ds.field("plant") == plant)
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+        conditions.append(ds.field(OP_POINT_COLUMN) >= pa.scalar(start.to_pydatetime(), type=time_type))
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field("date") <= end.strftime("%Y-%m-%d"))
+        conditions.append(ds.field(OP_POINT_COLUMN) <= pa.scalar(end.to_pydatetime(), type=time_type))
+    for column, (min_value, max_value) in (value_ranges or {}).items():
+        if column not in schema.names:
+            log_and_raise_error(f"Column '{column}' is not in the result store.")
+        if min_value is not None:
+            conditions.append(ds.field(column) >= min_value)
+        if max_value is not None:
+            conditions.append(ds.field(column) <= max_value)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    results = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    if OP_POINT_COLUMN in results.columns:
+        results = results.sort_values(by=OP_POINT_COLUMN).reset_index(drop=True)
+    logging.info(f"Result store: Query returned {len(results)} operational points from {store_dir}.")
+    return results
@@ -0,0 +1,169 @@
+import io
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+# suffix of the sidecar index file written next to the CSV file
+TIME_INDEX_SUFFIX = ".timeidx.json"
+
+# number of rows between two checkpoints of the index
+CHECKPOINT_ROWS = 10000
+
+# size of the blocks read while locating the line starts
+READ_BLOCK_SIZE = 1 << 24
+
+def get_time_range(config):
+    """
+  This function returns the configured time range (start, end) padded by the longest time window (of the config and
+  its profiles) on both sides, so that the windows of the points at the edges of the range are complete. A missing
+  bound is None, and None is returned if no range is configured.
+  """
+    if config.get("start") is None and config.get("end") is None:
+        return None
+    time_windows = [config["time_window"]] + [profile["time_window"] for profile in config.get("profiles") or []
+                                              if "time_window" in profile]
+    padding = pd.Timedelta(minutes=max(max(window) if isinstance(window, list) else window for window in time_windows))
+    start = pd.Timestamp(config["start"]) - padding if config.get("start") is not None else None
+    end = pd.Timestamp(config["end"]) + padding if config.get("end") is not None else None
+    return start, end
+
+def trim_to_time_range(op_points_df, additional_info_df, config):
+    """
+  This function drops the operational points (and their mean values) outside the configured time range: the data
+  is loaded with the padded range of get_time_range, so points can also be found within the padding.
+  """
+    if op_points_df.empty or (config.get("start") is None and config.get("end") is None):
+        return op_points_df, additional_info_df
+    points = pd.to_datetime(op_points_df["Operational Points"])
+    in_range = pd.Series(True, index=op_points_df.index)
+    if config.get("start") is not None:
+        in_range &= points >= pd.Timestamp(config["start"])
+    if config.get("end") is not None:
+        in_range &= points <= pd.Timestamp(config["end"])
+    if in_range.all():
+        return op_points_df, additional_info_df
+    logging.info(f"Time range: Dropped {int((~in_range).sum())} operational points outside of the range.")
+    return op_points_df[in_range].reset_index(drop=True), additional_info_df[in_range.values].reset_index(drop=True)
+
+def get_index_file(csv_file):
+    """
+  This function returns the path of the sidecar index file of a CSV file.
+  """
+    return csv_file + TIME_INDEX_SUFFIX
+
+def get_line_starts(csv_file, checkpoint_rows):
+    """
+  This function scans the CSV file for line breaks and returns the byte offsets of every checkpoint_rows-th data row
+  and the number of data rows (lines after the header).
+  """
+    offsets = []
+    newline_count = 0
+    position = 0
+    last_byte = b""
+    with open(csv_file, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord("\n"))
+            # newline 0 ends the header, data row i starts after newline i
+            rows = newline_count + np.arange(len(newlines))
+            offsets.extend((position + newlines[rows % checkpoint_rows == 0] + 1).tolist())
+            newline_count += len(newlines)
+            position += len(block)
+            last_byte = block[-1:]
+
+    data_rows = max(newline_count - 1, 0) + (1 if last_byte not in (b"", b"\n") and newline_count > 0 else 0)
+    # a trailing newline does not start a new row
+    return [offset for offset in offsets if offset < position], data_rows
+
+def build_time_index(csv_file, time_col, checkpoint_rows=CHECKPOINT_ROWS):
+    """
+  This function builds the sparse time index of a CSV file: the byte offset and timestamp of every checkpoint_rows-th
+  row, together with the size and modification time of the file. Only the time column is parsed. The index can only
+  be used to seek if the rows are sorted by time and every line is one row, otherwise it is marked as not sorted.
+  """
+    stat = os.stat(csv_file)
+    times = pd.read_csv(csv_file, usecols=lambda column: column.lower() == time_col)
+    if times.shape[1] != 1:
+        return None
+    times = pd.to_datetime(times.iloc[:, 0])
+    offsets, data_rows = get_line_starts(csv_file, checkpoint_rows)
+
+    # blank or multi-line rows would shift the offsets, then the index cannot be used to seek
+    sorted_rows = (data_rows == len(times) and len(offsets) == -(-len(times) // checkpoint_rows) and
+                   not times.isna().any() and times.is_monotonic_increasing)
+    checkpoint_times = times.iloc[::checkpoint_rows].values.astype("datetime64[ns]").view("int64")
+
+    return {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "time_column": time_col,
+        "checkpoint_rows": checkpoint_rows,
+        "rows": len(times),
+        "sorted": bool(sorted_rows),
+        "offsets": offsets if sorted_rows else [],
+        "times": checkpoint_times.tolist() if sorted_rows else []
+    }
+
+def load_time_index(csv_file, time_col):
+    """
+  This function loads the sidecar index of the CSV file, and (re)builds it on first use or when the size or
+  modification time of the file changed. If the index cannot be written next to the file, it is only kept in memory.
+  """
+    index_file = get_index_file(csv_file)
+    stat = os.stat(csv_file)
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, "r") as f:
+                index = json.load(f)
+            if (index.get("source_size") == stat.st_size and index.get("source_mtime_ns") == stat.st_mtime_ns and
+                    index.get("time_column") == time_col):
+                return index
+            logging.info("Time index: %s changed since the index was built, rebuilding it.", csv_file)
+        except (OSError, ValueError):
+            logging.warning("Time index: Index %s is unreadable, rebuilding it.", index_file)
+
+    index = build_time_index(csv_file, time_col)
+    if index is None:
+        return None
+    try:
+        with open(index_file, "w") as f:
+            json.dump(index, f)
+        logging.info(f"Time index: Built index of {index['rows']} rows for {csv_file}.")
+    except OSError as e:
+        logging.warning(f"Time index: Could not write {index_file} ({e}), the index is not kept.")
+    return index
+
+def read_time_range(csv_file, time_col, start, end):
+    """
+  This function reads only the part of a sorted CSV file that contains the rows from start to end (None for an open
+  bound), seeking to the checkpoints of the sidecar index around the range. The returned rows still have to be
+  filtered to the exact range. It returns None if the file cannot be read through the index (e.g. unsorted rows).
+  """
+    index = load_time_index(csv_file, time_col)
+    if index is None or not index["sorted"]:
+        logging.info("Time index: %s is not sorted by time, the whole file will be parsed.", csv_file)
+        return None
+    if index["rows"] == 0:
+        return pd.read_csv(csv_file)
+
+    times = np.asarray(index["times"], dtype=np.int64)
+    offsets = index["offsets"]
+
+    # the checkpoint before the range start (rows before it are earlier) and the first one after the range end
+    first = max(int(np.searchsorted(times, start.value, side="left")) - 1, 0) if start is not None else 0
+    last = int(np.searchsorted(times, end.value, side="right")) if end is not None else len(times)
+
+    with open(csv_file, "rb") as f:
+        header = f.readline()
+        f.seek(offsets[first])
+        if last <= first:
+            body = b""
+        else:
+            body = f.read(offsets[last] - offsets[first]) if last < len(offsets) else f.read()
+
+    logging.info(f"Time index: Parsing {len(body)} of {index['source_size']} bytes of {csv_file}.")
+    return pd.read_csv(io.BytesIO(header + body))
@@ -1,49 +1,452 @@
 import os
+import time
+import random
 import logging
+from datetime import datetime
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from version import __version__
+from utils.pipeline import run_pipeline
+from utils.run_report import write_run_report
 from data_manager.process_data import filter_data
 from data_manager.load_data import load_parse_data
+from data_manager.time_index import get_time_range, trim_to_time_range
+from data_manager.polars_backend import scan_filter_data
+from data_manager.memmap_store import load_memmap_store
+from data_manager.database_source import get_database_type, load_database_data
 from utils.logging_setup import initialize_logging
 from utils.logging_setup import log_and_raise_error
-from config.config_loader import load_validate_config
-from core.operational_points import find_operational_points
+from core.steady_state import SCORE_COLUMN
+from data_manager.result_store import append_results
+from config.config_loader import load_validate_config, get_config_hash, get_profile_configs
+from core.engines import run_engine, verify_engine, REFERENCE_ENGINE
+from core.multiresolution import find_operational_points_for_columns
+from data_manager.result_cache import get_cache_key, load_cached_result, store_cached_result
 
-def analyse_operational_points(config_file, input_file, output_dir):
+# number of input files that are read ahead of the detection in multi-file runs
+PREFETCH_FILES = 2
+
+def analyse_operational_points(config_file, input_file, output_dir, save_filtered=True, save_excel=True,
+                               log_level=logging.INFO, config_overrides=None):
     """
   This function serves as the orchestrator for loading, processing, extracting the operational points
   and their mean values, and saving outputs.
+  If the input file was already analysed with the same config (and the result cache is enabled), the cached results
+  are returned without loading the data, in that case the returned filtered data is None.
+  The input file can also be a file object with CSV data (e.g. stdin). If output_dir is None nothing is written to
+  disk, save_filtered and save_excel allow to skip the filtered data file and the Excel result files.
+  If a list of time windows is configured, the operational points and mean values are returned as
+  {time_window: df} and the result files get a "_<window>min" suffix.
+  If profiles are configured, the data is loaded once and all profiles are analysed in parallel, the results are
+  returned as {profile name: ...} and saved to one sub dir per profile, with a combined profiles_summary.xlsx.
+  Config overrides (e.g. the engine selected on the command line) replace the values of the config file.
+  If a memmap_dir is configured, the filtered columns are converted once into memory-mapped files and the
+  detection runs on them, the returned filtered data is None and it is not saved.
   """
     try:
-        # specify the ouptput files
-        filtered_data_file = os.path.join(output_dir, "input_file_filtered.xlsx")
-        op_points_file = os.path.join(output_dir, "only_operational_points.xlsx")
-        additional_info_file = os.path.join(output_dir, "op_with_mean_values.xlsx")
+        if output_dir is None:
+            save_filtered = save_excel = False
 
         # Step 1: initializes logging for console and file logging (and creates the output dir if necessary)
-        initialize_logging(output_dir)
-        
+        initialize_logging(output_dir, log_level)
+
         # Step 2: get the needed input vars from the config file
-        time_col, needed_columns, mean_values, config = load_validate_config(config_file)
+        setup = prepare_setup(config_file, save_filtered, save_excel, config_overrides)
 
-        # Step 3: load and parse the data
-        data = load_parse_data(input_file, time_col)
+        # Steps 3 to 7: read, filter, detect and write, one after another
+        run = {"input_file": input_file, "output_dir": output_dir}
+        for stage in (read_stage, filter_stage, detect_stage, write_stage):
+            run = stage(setup, run)
+        return run["results"]
 
-        # Step 4: clean and filter the data
-        filtered_data = filter_data(data, needed_columns, time_col, config["conditions"], config["row_to_remove"])
+    except Exception as e:
+        log_and_raise_error(f"An error occurred during processing: {e}")
 
-        # save the filtered data to a CSV
-        filtered_data.to_excel(filtered_data_file, index=False)
-        logging.info("Filtered data saved to %s", filtered_data_file)
+def analyse_input_files(config_file, input_files, output_dir, save_filtered=True, save_excel=True,
+                        log_level=logging.INFO, prefetch=PREFETCH_FILES, config_overrides=None):
+    """
+  This function analyses several input files with the same config in a staged pipeline: the read, filter, detect and
+  write stages run in their own threads connected by bounded queues, so that the next files are read (up to prefetch
+  files ahead) while the current one is detected and the previous one is written. The results of every file are
+  saved to a sub dir of the output dir named after the file, and the run report of the output dir shows the
+  utilization of every stage. It returns {input file: (filtered data, operational points, mean values)}.
+  """
+    try:
+        if output_dir is None:
+            save_filtered = save_excel = False
+        initialize_logging(output_dir, log_level)
+        setup = prepare_setup(config_file, save_filtered, save_excel, config_overrides)
 
-        # Step 5: get the operational points with their mean values
-        op_points_df, additional_info_df = find_operational_points(filtered_data, time_col, mean_values, config)
+        runs = []
+        for input_file, name in zip(input_files, get_input_names(input_files)):
+            runs.append({"input_file": input_file, "output_dir": os.path.join(output_dir, name) if output_dir else None})
 
-        # save operational points and mean values to a CSV
-        op_points_df.to_excel(op_points_file, index=False)
-        additional_info_df.to_excel(additional_info_file, index=False)
-        logging.info("Operational points saved to %s", op_points_file)
-        logging.info("Additional info saved to %s", additional_info_file)
+        stages = [(stage.__name__.replace("_stage", ""), partial(stage, setup))
+                  for stage in (read_stage, filter_stage, detect_stage, write_stage)]
+        runs, pipeline_stats = run_pipeline(runs, stages, prefetch)
 
-        return filtered_data,op_points_df, additional_info_df
+        if output_dir:
+            report = {
+                "version": __version__,
+                "engine": setup["config"]["engine"],
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "config_hash": get_config_hash(setup["config"]),
+                "prefetch": prefetch,
+                "wall_s": pipeline_stats["wall_s"],
+                "stages": pipeline_stats["stages"],
+                "bottleneck": max(pipeline_stats["stages"], key=lambda name: pipeline_stats["stages"][name]["busy_s"]),
+                "files": [{"input_file": run["report"]["input_file"], "output_dir": run["output_dir"],
+                           "cache_hit": run["report"]["cache_hit"]} for run in runs]
+            }
+            write_run_report(report, output_dir)
+        return {run["input_file"]: run["results"] for run in runs}
 
     except Exception as e:
         log_and_raise_error(f"An error occurred during processing: {e}")
+
+def get_input_names(input_files):
+    """
+  This function returns a unique output sub dir name for every input file (its file name without extension).
+  """
+    names = []
+    for input_file in input_files:
+        name = os.path.splitext(os.path.basename(input_file))[0]
+        unique_name, counter = name, 1
+        while unique_name in names:
+            counter += 1
+            unique_name = f"{name}_{counter}"
+        names.append(unique_name)
+    return names
+
+def prepare_setup(config_file, save_filtered, save_excel, config_overrides=None):
+    """
+  This function loads and validates the config, and returns what all stages of a run need.
+  """
+    time_col, needed_columns, mean_values, config = load_validate_config(config_file, config_overrides)
+    profiles = get_profile_configs(config) if config["profiles"] else [(None, config, needed_columns, mean_values)]
+    return {
+        "time_col": time_col,
+        "config": config,
+        "profiles": profiles,
+        "shared_columns": sorted(set(col for _, _, profile_columns, _ in profiles for col in profile_columns)),
+        "save_filtered": save_filtered,
+        "save_excel": save_excel
+    }
+
+def read_stage(setup, run):
+    """
+  This function is the read stage of a run: it returns the cached results or loads the input data.
+  """
+    input_file, config = run["input_file"], setup["config"]
+
+    # return the cached results if this input file was already analysed with the same config
+    # (file objects such as stdin cannot be fingerprinted, so they are never cached)
+    run["cache_key"] = None
+    if config["cache_dir"] and isinstance(input_file, str):
+        run["cache_key"] = get_cache_key(config, input_file, config["engine"])
+        cached_result = load_cached_result(config["cache_dir"], run["cache_key"], config["engine"])
+        if cached_result is not None:
+            run["cached"] = cached_result
+            run["report"] = cached_result[2]
+            run["report"]["cache_hit"] = True
+            return run
+
+    run["report"] = {
+        "version": __version__,
+        "engine": config["engine"],
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "input_file": os.path.abspath(input_file) if isinstance(input_file, str) else "<stream>",
+        "config_hash": get_config_hash(config),
+        "cache_hit": False,
+        "durations_s": {}
+    }
+
+    # Step 3 (memory-mapped mode): convert the filtered columns into memory-mapped .npy files chunk by chunk, or reuse
+    # the files of a previous run on the same input and filtering (e.g. with other margins), one store per profile
+    step_start = time.perf_counter()
+    if config["memmap_dir"]:
+        run["stores"] = {
+            name: load_memmap_store(config["memmap_dir"], input_file, setup["time_col"], setup["shared_columns"],
+                                    profile_config["conditions"], config["row_to_remove"], get_time_range(config))
+            for name, profile_config, _, _ in setup["profiles"]
+        }
+        run["report"]["source"] = "memmap"
+        run["report"]["memmap_reused"] = all(store["reused"] for store in run["stores"].values())
+        run["report"]["durations_s"]["load"] = round(time.perf_counter() - step_start, 3)
+        return run
+
+    # Step 3: load and parse the data (only the configured time range, padded by one time window),
+    # database inputs and the polars backend also remove the rows and keep the needed columns while reading
+    data, source = load_input_data(input_file, setup["time_col"], setup["shared_columns"], config)
+    run["data"], run["source"] = data, source
+    run["report"]["source"] = source
+    run["report"]["rows_loaded"] = len(data)
+    run["report"]["durations_s"]["load"] = round(time.perf_counter() - step_start, 3)
+    return run
+
+def filter_stage(setup, run):
+    """
+  This function is the filter stage of a run: it cleans and filters the data for every profile
+  (memory-mapped stores are already filtered).
+  """
+    if "cached" in run or "stores" in run:
+        return run
+    time_col, config = setup["time_col"], setup["config"]
+    data = run.pop("data")
+    step_start = time.perf_counter()
+
+    # Step 4: with several profiles, remove the rows and keep the columns needed by any profile only once
+    # (the conditions of each profile are applied afterwards on this shared data)
+    row_to_remove = None if run["source"] != "pandas" else config["row_to_remove"]
+    if config["profiles"] and row_to_remove:
+        data = filter_data(data, setup["shared_columns"], time_col, {}, row_to_remove)
+        row_to_remove = None
+
+    # the conditions of several profiles are applied in parallel threads on the shared in-memory data
+    def filter_profile(profile):
+        _, profile_config, profile_columns, _ = profile
+        return filter_data(data, profile_columns, time_col, profile_config["conditions"], row_to_remove)
+
+    profiles = setup["profiles"]
+    if len(profiles) == 1:
+        filtered_data = [filter_profile(profiles[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(profiles), os.cpu_count() or 1)) as executor:
+            filtered_data = list(executor.map(filter_profile, profiles))
+    run["filtered_data"] = {profile[0]: profile_data for profile, profile_data in zip(profiles, filtered_data)}
+    run["report"]["durations_s"]["filter"] = round(time.perf_counter() - step_start, 3)
+    return run
+
+def detect_stage(setup, run):
+    """
+  This function is the detection stage of a run: it finds the operational points with their mean values for every
+  profile and time window.
+  """
+    if "cached" in run:
+        return run
+    time_col = setup["time_col"]
+    step_start = time.perf_counter()
+
+    # Step 5: get the operational points with their mean values for every time window with the configured engine
+    # (the vectorized engine skips the rows that cannot pass with the steady-state score, and checks the margins
+    # coarse-to-fine), several profiles run in parallel threads on the shared in-memory data
+    def run_profile(profile):
+        name, profile_config, _, profile_mean_values = profile
+        if "stores" in run:
+            store = run["stores"][name]
+            window_results = find_operational_points_for_columns(store["times"], store["columns"], time_col,
+                                                                 profile_mean_values, profile_config, store["time_unit"])
+        else:
+            window_results = detect_profile(run["filtered_data"][name], time_col, profile_mean_values, profile_config)
+
+        # the data was loaded with the time range padded by a time window, only the points within the range are kept
+        return {
+            time_window: (*trim_to_time_range(op_points_df, additional_info_df, profile_config), score, candidates)
+            for time_window, (op_points_df, additional_info_df, score, candidates) in window_results.items()
+        }
+
+    profiles = setup["profiles"]
+    if len(profiles) == 1:
+        run["window_results"] = [run_profile(profiles[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(profiles), os.cpu_count() or 1)) as executor:
+            run["window_results"] = list(executor.map(run_profile, profiles))
+    run["report"]["durations_s"]["detect"] = round(time.perf_counter() - step_start, 3)
+
+    # cross-check the engine against the reference engine on sampled slices (for the configured fraction of runs),
+    # not in the memory-mapped mode that has no filtered data in memory
+    config = setup["config"]
+    if config["engine"] != REFERENCE_ENGINE and "stores" not in run and random.random() < config["verify_fraction"]:
+        step_start = time.perf_counter()
+        verification = {
+            name: verify_engine(config["engine"], run["filtered_data"][name], time_col, profile_mean_values,
+                                profile_config, config["verify_rows"])
+            for name, profile_config, _, profile_mean_values in profiles
+        }
+        run["report"]["verification"] = verification if config["profiles"] else verification[None]
+        run["report"]["durations_s"]["verify"] = round(time.perf_counter() - step_start, 3)
+    return run
+
+def write_stage(setup, run):
+    """
+  This function is the write stage of a run: it saves the results, writes the run report and caches the results.
+  """
+    time_col, config, output_dir = setup["time_col"], setup["config"], run["output_dir"]
+    save_filtered, save_excel = setup["save_filtered"] and output_dir, setup["save_excel"] and output_dir
+    report = run["report"]
+
+    if "cached" in run:
+        op_points_df, additional_info_df, _ = run.pop("cached")
+        if save_excel:
+            if config["profiles"]:
+                for name in op_points_df:
+                    save_window_results(op_points_df[name], additional_info_df[name], os.path.join(output_dir, name))
+                save_profiles_summary(report["profiles"], output_dir)
+            else:
+                save_window_results(op_points_df, additional_info_df, output_dir)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            write_run_report(report, output_dir)
+        run["results"] = (None, op_points_df, additional_info_df)
+        return run
+
+    # Step 6: save the filtered data and the operational points and mean values (one pair of files per time window),
+    # and append the results to the result store (if specified)
+    step_start = time.perf_counter()
+    filtered_data, op_points_df, additional_info_df, profile_reports = {}, {}, {}, {}
+    for (name, profile_config, _, _), window_results in zip(setup["profiles"], run.pop("window_results")):
+        # the memory-mapped mode has no filtered data in memory (None is returned instead)
+        profile_data = run["filtered_data"][name] if "filtered_data" in run else None
+        rows_filtered = len(profile_data) if profile_data is not None else run["stores"][name]["rows"]
+        multiple_windows = isinstance(profile_config["time_window"], list)
+        filtered_data[name] = profile_data
+        op_points_df[name] = unpack_windows({w: r[0] for w, r in window_results.items()}, multiple_windows)
+        additional_info_df[name] = unpack_windows({w: r[1] for w, r in window_results.items()}, multiple_windows)
+        profile_reports[name] = {
+            "time_window": profile_config["time_window"],
+            "rows_filtered": rows_filtered,
+            "candidates": unpack_windows(
+                {w: int(c.sum()) if c is not None else rows_filtered for w, (_, _, _, c) in window_results.items()},
+                multiple_windows
+            ),
+            "operational_points": unpack_windows({w: len(r[0]) for w, r in window_results.items()}, multiple_windows)
+        }
+
+        profile_dir = os.path.join(output_dir, name) if output_dir and name else output_dir
+        if save_filtered and profile_data is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            filtered_data_file = os.path.join(profile_dir, "input_file_filtered.xlsx")
+            profile_data.to_excel(filtered_data_file, index=False)
+            logging.info("Filtered data saved to %s", filtered_data_file)
+        if save_excel:
+            save_window_results(op_points_df[name], additional_info_df[name], profile_dir)
+
+        if config["result_store"]:
+            for time_window, (_, window_info_df, _, _) in window_results.items():
+                append_results(config["result_store"], window_info_df, time_col, get_config_hash(config),
+                               config["plant"], time_window, name)
+    run.pop("filtered_data", None)
+    run.pop("stores", None)
+    report["durations_s"]["save"] = round(time.perf_counter() - step_start, 3)
+
+    if config["profiles"]:
+        report["profiles"] = profile_reports
+        if save_excel:
+            save_profiles_summary(profile_reports, output_dir)
+        # like a single config, the filtered data is None if no profile has it in memory (memory-mapped mode)
+        if all(profile_data is None for profile_data in filtered_data.values()):
+            filtered_data = None
+    else:
+        report.update(profile_reports[None])
+        filtered_data, op_points_df, additional_info_df = filtered_data[None], op_points_df[None], additional_info_df[None]
+
+    # Step 7: write the run report and cache the results (if enabled), the output (sub) dir of a file only exists
+    # yet if a result file was saved to it
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        write_run_report(report, output_dir)
+    if run["cache_key"]:
+        store_cached_result(config["cache_dir"], run["cache_key"], config["engine"], op_points_df, additional_info_df,
+                            report, config["cache_max_entries"])
+
+    run["results"] = (filtered_data, op_points_df, additional_info_df)
+    return run
+
+def load_input_data(input_file, time_col, needed_columns, config):
+    """
+  This function loads the input data with the configured backend, and returns it with the name of the source
+  ("pandas", "polars", "sqlite" or "duckdb"). SQLite and DuckDB files are queried with the filtering pushed down
+  to the database, and the polars backend scans CSV files lazily; both already remove row_to_remove, keep only the
+  needed columns and apply the conditions (unless profiles are configured, then their conditions are applied later).
+  """
+    conditions = {} if config["profiles"] else config["conditions"]
+    time_range = get_time_range(config)
+
+    database_type = get_database_type(input_file)
+    if database_type:
+        data = load_database_data(input_file, time_col, needed_columns, conditions, config["row_to_remove"],
+                                  config["table"], config["query"], time_range)
+        return data, database_type
+
+    if config["backend"] == "polars" and isinstance(input_file, str) and input_file.endswith(".csv"):
+        data = scan_filter_data(input_file, time_col, needed_columns, conditions, config["row_to_remove"], time_range)
+        return data, "polars"
+
+    return load_parse_data(input_file, time_col, time_range, config["time_index"]), "pandas"
+
+def detect_profile(filtered_data, time_col, mean_values, config):
+    """
+  This function finds the operational points of one config (or profile) for every time window with the configured
+  engine, and adds the steady-state score to the filtered data (if enabled).
+  It returns {time_window: (op_points_df, additional_info_df, score, candidates)}.
+  """
+    window_results = run_engine(config["engine"], filtered_data, time_col, mean_values, config)
+
+    if config["export_score"]:
+        multiple_windows = isinstance(config["time_window"], list)
+        for time_window, (_, _, score, _) in window_results.items():
+            if score is not None:
+                filtered_data[get_output_name(SCORE_COLUMN, time_window, multiple_windows)] = score
+    return window_results
+
+def save_operational_points(op_points_df, additional_info_df, op_points_file, additional_info_file):
+    """
+  This function saves the operational points and their mean values.
+  """
+    op_points_df.to_excel(op_points_file, index=False)
+    additional_info_df.to_excel(additional_info_file, index=False)
+    logging.info("Operational points saved to %s", op_points_file)
+    logging.info("Additional info saved to %s", additional_info_file)
+
+def save_window_results(op_points, additional_info, output_dir):
+    """
+  This function saves the operational points and mean values of one or several ({time_window: df}) time windows.
+  """
+    os.makedirs(output_dir, exist_ok=True)
+    if not isinstance(op_points, dict):
+        op_points, additional_info = {None: op_points}, {None: additional_info}
+    multiple_windows = None not in op_points
+    for time_window in op_points:
+        save_operational_points(
+            op_points[time_window], additional_info[time_window],
+            os.path.join(output_dir, get_output_name("only_operational_points", time_window, multiple_windows) + ".xlsx"),
+            os.path.join(output_dir, get_output_name("op_with_mean_values", time_window, multiple_windows) + ".xlsx")
+        )
+
+def save_profiles_summary(profile_reports, output_dir):
+    """
+  This function saves one combined summary (rows, candidates and operational points per profile and time window)
+  of a multi-profile run.
+  """
+    import pandas as pd
+
+    rows = []
+    for name, profile_report in profile_reports.items():
+        candidates = profile_report["candidates"]
+        op_points = profile_report["operational_points"]
+        if not isinstance(op_points, dict):
+            time_window = profile_report["time_window"]
+            candidates, op_points = {time_window: candidates}, {time_window: op_points}
+        for time_window in op_points:
+            rows.append({
+                "profile": name,
+                "time_window": time_window,
+                "rows_filtered": profile_report["rows_filtered"],
+                "candidates": candidates[time_window],
+                "operational_points": op_points[time_window]
+            })
+    summary_file = os.path.join(output_dir, "profiles_summary.xlsx")
+    pd.DataFrame(rows).to_excel(summary_file, index=False)
+    logging.info("Profiles summary saved to %s", summary_file)
+
+def get_output_name(name, time_window, multiple_windows):
+    """
+  This function adds the time window suffix to an output (file or column) name, if several windows are configured.
+  """
+    return f"{name}_{time_window}min" if multiple_windows else name
+
+def unpack_windows(results_by_window, multiple_windows):
+    """
+  This function returns the per-window results as they are, or the only result if a single window is configured.
+  """
+    return results_by_window if multiple_windows else next(iter(results_by_window.values()))
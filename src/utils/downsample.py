@@ -0,0 +1,71 @@
+import numpy as np
+
+def get_visible_range(x, x_min, x_max):
+    """
+  This function returns the index range [lo, hi) of the sorted x values within [x_min, x_max], extended by one point
+  on each side, so that the lines still reach the borders of the view.
+  """
+    lo = max(int(np.searchsorted(x, x_min, side="left")) - 1, 0)
+    hi = min(int(np.searchsorted(x, x_max, side="right")) + 1, len(x))
+    return lo, hi
+
+def minmax_downsample(y, buckets, lo=0, hi=None):
+    """
+  This function returns the indices of the points to draw for y[lo:hi] with at most 2 * buckets points: the range is
+  split into buckets of equal sample count (one per pixel column), and the minimum and maximum of every bucket are
+  kept in their original order. Since a pixel column shows the range between its minimum and maximum, the plot looks
+  the same as with all points. NaN values are ignored (an all-NaN bucket keeps its first point).
+  """
+    hi = len(y) if hi is None else hi
+    count = hi - lo
+    if count <= 2 * buckets:
+        return np.arange(lo, hi)
+
+    bucket_size = -(-count // buckets)
+    padded_count = bucket_size * (-(-count // bucket_size))
+    segment = np.asarray(y[lo:hi], dtype=float)
+    for_min = np.full(padded_count, np.inf)
+    for_max = np.full(padded_count, -np.inf)
+    for_min[:count] = np.where(np.isnan(segment), np.inf, segment)
+    for_max[:count] = np.where(np.isnan(segment), -np.inf, segment)
+
+    offsets = np.arange(0, padded_count, bucket_size)
+    min_indices = offsets + for_min.reshape(-1, bucket_size).argmin(axis=1)
+    max_indices = offsets + for_max.reshape(-1, bucket_size).argmax(axis=1)
+    indices = np.unique(np.concatenate([min_indices, max_indices]))
+    return lo + indices[indices < count]
+
+def lttb_downsample(x, y, threshold, lo=0, hi=None):
+    """
+  This function returns the indices of the points to draw for x[lo:hi], y[lo:hi] with the Largest-Triangle-Three-
+  Buckets algorithm: the first and last points are kept, and from every bucket in between the point that forms the
+  largest triangle with the point kept before and the mean of the next bucket. It keeps the visual shape of the
+  signal with exactly threshold points. Points with NaN values are only kept if a bucket has no other points.
+  """
+    hi = len(y) if hi is None else hi
+    count = hi - lo
+    if threshold >= count or threshold < 3:
+        return np.arange(lo, hi)
+
+    x = np.asarray(x[lo:hi], dtype=float)
+    y = np.asarray(y[lo:hi], dtype=float)
+    # bucket boundaries for the points between the first and the last one
+    edges = np.floor(np.linspace(1, count - 1, threshold - 1)).astype(np.int64)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else count
+        next_end = max(next_end, next_start + 1)
+        next_x = x[next_start:next_end].mean()
+        next_values = y[next_start:next_end]
+        next_y = np.nanmean(next_values) if not np.isnan(next_values).all() else y[previous]
+
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) -
+                      (x[previous] - x[start:end]) * (next_y - y[previous]))
+        area = np.where(np.isnan(area), -1, area)
+        previous = start + int(area.argmax())
+        indices[bucket + 1] = previous
+    return lo + indices
@@ -2,28 +2,33 @@ import os
 import logging
 from utils.file_management import create_output_dir, cleanup_file_content
 
-def initialize_logging(output_dir):
+def initialize_logging(output_dir, level=logging.INFO):
     """
   This function initializes logging with the specified level, console and file logging, and log rotation.
+  If no output dir is given, only the console (stderr) logging is set up, so that nothing is written to disk.
   """
-    # create the output directory, if it does not exist
-    create_output_dir(output_dir)
-    log_file_name = "logging_output.txt"
-    log_file = os.path.join(output_dir, log_file_name)
-    cleanup_file_content(log_file)
-
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
-        
+
+    handlers = [logging.StreamHandler()]
+    log_file = None
+    if output_dir:
+        # create the output directory, if it does not exist
+        create_output_dir(output_dir)
+        log_file_name = "logging_output.txt"
+        log_file = os.path.join(output_dir, log_file_name)
+        cleanup_file_content(log_file)
+        handlers.append(logging.FileHandler(log_file))
+
     logging.basicConfig(
-        level=logging.INFO,
+        level=level,
         format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(log_file)
-        ]
+        handlers=handlers
     )
-    logging.info("Logging initialized. Logs are being saved to %s", log_file)
+    if log_file:
+        logging.info("Logging initialized. Logs are being saved to %s", log_file)
+    else:
+        logging.info("Logging initialized. Logs are only written to the console.")
 
 def log_and_raise_error(message):
     """
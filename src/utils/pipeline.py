@@ -0,0 +1,93 @@
+import time
+import queue
+import logging
+import threading
+
+# marks the end of the items in a queue
+END_OF_ITEMS = object()
+
+def run_stage(name, function, input_queue, output_queue, stats, failed, errors):
+    """
+  This function runs one stage of the pipeline: it takes the items from its input queue, processes them and puts the
+  results into its output queue, until the end of the items. The time spent processing (busy), waiting for an item
+  (idle) and waiting for space in the output queue (blocked) is added to the stage stats. After an error in any stage,
+  the remaining items are only passed on (and discarded at the end), so that no stage blocks forever.
+  """
+    while True:
+        wait_start = time.perf_counter()
+        item = input_queue.get()
+        stats["idle_s"] += time.perf_counter() - wait_start
+        if item is END_OF_ITEMS:
+            output_queue.put(END_OF_ITEMS)
+            return
+
+        if not failed.is_set():
+            busy_start = time.perf_counter()
+            try:
+                item = function(item)
+                stats["items"] += 1
+            except Exception as e:
+                errors.append((name, e))
+                failed.set()
+            stats["busy_s"] += time.perf_counter() - busy_start
+
+        wait_start = time.perf_counter()
+        output_queue.put(item)
+        stats["blocked_s"] += time.perf_counter() - wait_start
+
+def run_pipeline(items, stages, queue_size=2):
+    """
+  This function runs the items through the stages ([(name, function)]), with one thread per stage connected by
+  bounded queues: while an item is processed by a stage, the next items are already processed by the stages before
+  it, up to queue_size items ahead. It returns the results of the last stage (in the order of the items) and the
+  stats of every stage, with its utilization (busy time / wall time) to spot the bottleneck.
+  If a stage raises an error, the pipeline stops and the first error is raised again.
+  """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    stats = {name: {"items": 0, "busy_s": 0.0, "idle_s": 0.0, "blocked_s": 0.0} for name, _ in stages}
+    failed = threading.Event()
+    errors = []
+
+    pipeline_start = time.perf_counter()
+    threads = [
+        threading.Thread(target=run_stage, args=(name, function, queues[i], queues[i + 1], stats[name], failed, errors),
+                         name=f"pipeline-{name}", daemon=True)
+        for i, (name, function) in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+
+    results = []
+    def collect_results():
+        while True:
+            item = queues[-1].get()
+            if item is END_OF_ITEMS:
+                return
+            results.append(item)
+    collector = threading.Thread(target=collect_results, name="pipeline-results", daemon=True)
+    collector.start()
+
+    # the bounded first queue limits how far the first stage reads ahead
+    for item in items:
+        if failed.is_set():
+            break
+        queues[0].put(item)
+    queues[0].put(END_OF_ITEMS)
+
+    for thread in threads:
+        thread.join()
+    collector.join()
+    wall_s = time.perf_counter() - pipeline_start
+
+    for name, stage_stats in stats.items():
+        for key in ("busy_s", "idle_s", "blocked_s"):
+            stage_stats[key] = round(stage_stats[key], 3)
+        stage_stats["utilization"] = round(stage_stats["busy_s"] / wall_s, 3) if wall_s > 0 else 0.0
+    logging.info("Pipeline: " + ", ".join(f"{name} {stage_stats['utilization']:.0%}" for name, stage_stats in stats.items())
+                 + f" busy over {wall_s:.2f} s.")
+
+    if errors:
+        name, error = errors[0]
+        logging.error(f"Pipeline: Stage '{name}' failed: {error}")
+        raise error
+    return results, {"wall_s": round(wall_s, 3), "stages": stats}
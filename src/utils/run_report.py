@@ -0,0 +1,13 @@
+import os
+import json
+import logging
+
+def write_run_report(report, output_dir):
+    """
+  This function writes the run report (row counts, durations, cache usage, ...) as a JSON file to the output dir.
+  """
+    report_file = os.path.join(output_dir, "run_report.json")
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    logging.info("Run report saved to %s", report_file)
+    return report_file
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import yaml
+import tempfile
+import unittest
+import subprocess
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+class TestHeadlessCli(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp_dir.name, "config.yaml")
+        config = {
+            "time_window": 1,
+            "row_to_remove": None,
+            "time_column": "time",
+            "mean_values": ["col1", "col2", "col3"],
+            "conditions": {},
+            "margins": [{"column": "col1", "margin": 1}, {"column": "col3", "margin": 0.5}]
+        }
+        with open(self.config_file, "w") as f:
+            yaml.dump(config, f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_cli(self, *args, stdin=None):
+        env = {**os.environ, "PYTHONPATH": SRC_DIR}
+        return subprocess.run(
+            [sys.executable, "-m", "cli", "run", "-c", self.config_file, "--log-level", "WARNING", *args],
+            env=env, input=stdin, capture_output=True, check=True
+        )
+
+    def test_ndjson_from_stdin(self):
+        """
+      In this test, we check that CSV data can be piped through stdin and the operational points are written to stdout
+      as NDJSON, without writing any files.
+      """
+        with open(self.test_file, "rb") as f:
+            result = self.run_cli("-i", "-", "-f", "ndjson", stdin=f.read())
+
+        records = [json.loads(line) for line in result.stdout.decode().splitlines()]
+        self.assertListEqual([record["time"][:19] for record in records],
+                             ["2024-11-12T10:00:00", "2024-11-13T10:00:00", "2024-11-14T10:00:00"])
+        self.assertListEqual([record["col1"] for record in records], [100.0, 110.0, 105.0])
+
+    def test_no_intermediate_artifacts(self):
+        """
+      In this test, we check that --no-intermediate skips the filtered data file in the output dir.
+      """
+        output_dir = os.path.join(self.tmp_dir.name, "output")
+        self.run_cli("-i", self.test_file, "-o", output_dir, "--no-intermediate")
+
+        output_files = os.listdir(output_dir)
+        self.assertNotIn("input_file_filtered.xlsx", output_files)
+        self.assertIn("only_operational_points.xlsx", output_files)
+        self.assertIn("op_with_mean_values.xlsx", output_files)
+
+    def test_stdout_format_without_filtered_data(self):
+        """
+      In this test, we check that the stdout formats do not write the filtered data file, even with an output dir.
+      """
+        output_dir = os.path.join(self.tmp_dir.name, "output")
+        result = self.run_cli("-i", self.test_file, "-o", output_dir, "-f", "ndjson")
+
+        self.assertEqual(len(result.stdout.decode().splitlines()), 3)
+        output_files = os.listdir(output_dir)
+        self.assertNotIn("input_file_filtered.xlsx", output_files)
+        self.assertNotIn("op_with_mean_values.xlsx", output_files)
+
+if __name__ == "__main__":
+    unittest.main()
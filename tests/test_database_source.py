@@ -0,0 +1,100 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+import importlib.util
+import pandas as pd
+import yaml
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.data_manager.process_data import filter_data
+from src.data_manager.load_data import load_parse_data
+from src.data_manager.database_source import load_database_data
+from src.main import analyse_operational_points
+
+class TestDatabaseSource(unittest.TestCase):
+    def setUp(self):
+        self.time_col = "time"
+        self.row_to_remove = "1970-01-01 00:00:00"
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw_data = pd.read_csv(self.test_file)
+        self.raw_data.columns = [col.upper() if col == "col1" else col for col in self.raw_data.columns]
+
+        self.sqlite_file = os.path.join(self.tmp.name, "historian.db")
+        connection = sqlite3.connect(self.sqlite_file)
+        self.raw_data.to_sql("measurements", connection, index=False)
+        connection.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_same_as_csv(self, database_file, **source):
+        needed_columns = ["col1", "col3", "col9"]
+        expected = filter_data(load_parse_data(self.test_file, self.time_col), needed_columns, self.time_col,
+                               {"col9": 3}, self.row_to_remove)
+        actual = load_database_data(database_file, self.time_col, needed_columns, {"col9": 3}, self.row_to_remove,
+                                    **source)
+        assert_frame_equal(actual, expected)
+
+    def test_sqlite_table_and_query(self):
+        """
+      In this test, we check that the filtered data read from a SQLite table or query is the same as the one of the
+      CSV file.
+      """
+        self.assert_same_as_csv(self.sqlite_file, table="measurements")
+        self.assert_same_as_csv(self.sqlite_file, query="SELECT * FROM measurements WHERE col2 > 0")
+
+    @unittest.skipUnless(importlib.util.find_spec("duckdb"), "duckdb is not installed")
+    def test_duckdb_table(self):
+        """
+      In this test, we check that the filtered data read from a DuckDB table with a TIMESTAMP column is the same as
+      the one of the CSV file.
+      """
+        import duckdb
+
+        duckdb_file = os.path.join(self.tmp.name, "historian.duckdb")
+        connection = duckdb.connect(duckdb_file)
+        connection.register("raw_data", self.raw_data)
+        connection.execute("CREATE TABLE measurements AS SELECT * REPLACE (CAST(time AS TIMESTAMP) AS time) FROM raw_data")
+        connection.close()
+        self.assert_same_as_csv(duckdb_file, table="measurements")
+
+    def test_analysis_from_database(self):
+        """
+      In this test, we check that the whole analysis gives the same operational points for the SQLite file as for
+      the CSV file.
+      """
+        config = {
+            "time_window": 1,
+            "row_to_remove": self.row_to_remove,
+            "time_column": "time",
+            "mean_values": ["col1", "col2", "col3"],
+            "conditions": {"col9": 3},
+            "margins": [{"column": "col1", "margin": 1}, {"column": "col3", "margin": 0.5}],
+            "table": "measurements"
+        }
+        config_file = os.path.join(self.tmp.name, "config.yaml")
+        with open(config_file, "w") as f:
+            yaml.safe_dump(config, f)
+
+        _, op_points, additional_info = analyse_operational_points(config_file, self.sqlite_file, None)
+        _, expected_op_points, expected_additional_info = analyse_operational_points(config_file, self.test_file, None)
+        self.assertGreater(len(op_points), 0)
+        assert_frame_equal(op_points, expected_op_points)
+        assert_frame_equal(additional_info, expected_additional_info)
+
+    def test_missing_table(self):
+        """
+      In this test, we check that a database input without a table or query is rejected.
+      """
+        with self.assertRaises(ValueError):
+            load_database_data(self.sqlite_file, self.time_col, ["col1"], {}, None)
+        with self.assertRaises(ValueError):
+            load_database_data(self.sqlite_file, self.time_col, ["col1"], {}, None, table="not_a_table")
+
+if __name__ == "__main__":
+    unittest.main()
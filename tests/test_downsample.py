@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.utils.downsample import get_visible_range, minmax_downsample, lttb_downsample
+
+class TestDownsample(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(100000, dtype=float)
+        self.y = np.cumsum(rng.normal(size=len(self.x)))
+        self.y[51234] = 1000.0
+        self.y[77777] = -1000.0
+
+    def test_minmax_keeps_extremes(self):
+        """
+      In this test, we check that the min/max downsampling keeps at most two points per bucket in order, including the
+      spikes and the global minimum and maximum.
+      """
+        indices = minmax_downsample(self.y, 500)
+        self.assertLessEqual(len(indices), 1000)
+        self.assertTrue((np.diff(indices) > 0).all())
+        self.assertIn(51234, indices)
+        self.assertIn(77777, indices)
+        self.assertEqual(self.y[indices].max(), self.y.max())
+        self.assertEqual(self.y[indices].min(), self.y.min())
+
+    def test_minmax_visible_range(self):
+        """
+      In this test, we check that the visible range covers the x limits, and that only points within it are kept with
+      its maximum.
+      """
+        lo, hi = get_visible_range(self.x, 20000.5, 60000.5)
+        self.assertEqual((lo, hi), (20000, 60002))
+        indices = minmax_downsample(self.y, 100, lo, hi)
+        self.assertTrue(((indices >= lo) & (indices < hi)).all())
+        self.assertEqual(self.y[indices].max(), self.y[lo:hi].max())
+
+    def test_minmax_nan_and_short_input(self):
+        """
+      In this test, we check that NaN values are ignored by the min/max downsampling, and that inputs with fewer points
+      than two per bucket are returned unchanged.
+      """
+        y = self.y.copy()
+        y[:50000] = np.nan
+        indices = minmax_downsample(y, 100)
+        self.assertEqual(np.nanmax(y[indices]), np.nanmax(y))
+        np.testing.assert_array_equal(minmax_downsample(self.y[:150], 100), np.arange(150))
+
+    def test_lttb(self):
+        """
+      In this test, we check that LTTB returns the requested number of points in order, keeps the first and last points
+      of the range and the spikes, and returns short ranges unchanged.
+      """
+        indices = lttb_downsample(self.x, self.y, 1000)
+        self.assertEqual(len(indices), 1000)
+        self.assertEqual((indices[0], indices[-1]), (0, len(self.x) - 1))
+        self.assertTrue((np.diff(indices) > 0).all())
+        self.assertIn(51234, indices)
+        self.assertIn(77777, indices)
+
+        indices = lttb_downsample(self.x, self.y, 100, 1000, 5000)
+        self.assertEqual((indices[0], indices[-1]), (1000, 4999))
+        np.testing.assert_array_equal(lttb_downsample(self.x, self.y, 1000, 0, 500), np.arange(500))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.core.engines import ENGINES, VERIFY_SLICES, VERIFY_WINDOWS, get_engine, get_verify_slices, register_engine, \
+    run_engine, verify_engine
+
+class TestEngines(unittest.TestCase):
+    def setUp(self):
+        self.time_col = "time"
+        self.mean_values = ["col1", "col2"]
+        self.config = {"time_window": [1, 3], "margins": [{"column": "col1", "margin": 0.8}]}
+        rng = np.random.default_rng(5)
+        levels = np.repeat(rng.uniform(0, 10, 20), 100)
+        self.data = pd.DataFrame({
+            "time": pd.Timestamp("2024-11-12") + pd.to_timedelta(np.cumsum(rng.integers(1, 10, 2000)), unit="s"),
+            "col1": levels + rng.normal(0, 0.2, 2000),
+            "col2": rng.normal(100, 1, 2000)
+        })
+
+    def tearDown(self):
+        ENGINES.pop("broken", None)
+
+    def test_engines_agree(self):
+        """
+      In this test, we check that the vectorized engine returns the same DataFrames as the reference engine
+      for every time window.
+      """
+        reference_results = run_engine("reference", self.data, self.time_col, self.mean_values, self.config)
+        vectorized_results = run_engine("vectorized", self.data, self.time_col, self.mean_values, self.config)
+        self.assertListEqual(list(vectorized_results), [1, 3])
+        for time_window, (op_points, additional_info, _, _) in vectorized_results.items():
+            self.assertGreater(len(op_points), 0)
+            assert_frame_equal(op_points, reference_results[time_window][0])
+            assert_frame_equal(additional_info, reference_results[time_window][1])
+
+    def test_unknown_engine(self):
+        """
+      In this test, we check that an unknown engine name is rejected.
+      """
+        with self.assertRaises(ValueError):
+            get_engine("not_an_engine")
+
+    def test_verify_reports_differences(self):
+        """
+      In this test, we check that the verification passes for the vectorized engine, and reports the differing
+      points of an engine that misses points and changes mean values.
+      """
+        report = verify_engine("vectorized", self.data, self.time_col, self.mean_values, self.config, 500,
+                               np.random.default_rng(0))
+        self.assertTrue(report["passed"])
+        self.assertFalse(report["inconclusive"])
+        self.assertGreater(report["points"], 0)
+        self.assertEqual(report["rows"], 1500)
+        self.assertEqual(len(report["slices"]), 3)
+
+        def broken_engine(data, time_col, mean_values, config):
+            results = get_engine("vectorized")(data, time_col, mean_values, config)
+            op_points, additional_info, score, candidates = results[1]
+            additional_info = additional_info.iloc[1:].copy()
+            additional_info.iloc[0, 1] += 1
+            results[1] = (op_points.iloc[1:], additional_info, score, candidates)
+            return results
+
+        register_engine("broken", broken_engine)
+        report = verify_engine("broken", self.data, self.time_col, self.mean_values, self.config, 2000)
+        self.assertFalse(report["passed"])
+        self.assertListEqual(list(report["differences"]), [1])
+        self.assertEqual(len(report["differences"][1]["only_reference"]), 1)
+        self.assertEqual(len(report["differences"][1]["different_values"]), 1)
+        self.assertListEqual(report["differences"][1]["only_engine"], [])
+
+    def test_verify_slices_span_windows(self):
+        """
+      In this test, we check that the verified slices span several of the longest time window whatever verify_rows,
+      do not overlap, and that the whole data is verified if it is too short for separate slices.
+      """
+        slices = get_verify_slices(self.data, self.time_col, {**self.config, "time_window": [1, 20]}, 1,
+                                   np.random.default_rng(0))
+        self.assertEqual(len(slices), 1)
+        self.assertEqual(slices[0], (0, len(self.data)))
+
+        slices = get_verify_slices(self.data, self.time_col, self.config, 1, np.random.default_rng(0))
+        self.assertEqual(len(slices), VERIFY_SLICES)
+        for start, stop in slices:
+            span = self.data[self.time_col].iloc[stop - 1] - self.data[self.time_col].iloc[start]
+            self.assertGreater(span, pd.Timedelta(minutes=3) * VERIFY_WINDOWS / 2)
+        self.assertTrue(all(stop <= start for (_, stop), (start, _) in zip(slices, slices[1:])))
+
+    def test_verify_inconclusive(self):
+        """
+      In this test, we check that the verification is flagged as inconclusive (and not passed) if the reference
+      engine finds no operational points in the slices, or if the engines cannot run on them.
+      """
+        config = {**self.config, "margins": [{"column": "col1", "margin": 0.01}]}
+        report = verify_engine("vectorized", self.data, self.time_col, self.mean_values, config, 500)
+        self.assertIsNone(report["passed"])
+        self.assertTrue(report["inconclusive"])
+        self.assertIn("no operational points", report["reason"])
+
+        config = {**self.config, "margins": [{"column": "not_a_column", "margin": 1}]}
+        report = verify_engine("vectorized", self.data, self.time_col, self.mean_values, config, 500)
+        self.assertIsNone(report["passed"])
+        self.assertTrue(report["inconclusive"])
+        self.assertIn("error", report["slices"][0])
+
+if __name__ == "__main__":
+    unittest.main()
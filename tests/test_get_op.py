@@ -1,13 +1,18 @@
 import os
 import sys
 import unittest
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 from src.data_manager.process_data import filter_data
 from src.data_manager.load_data import load_parse_data
 from src.core.operational_points import find_operational_points 
+from src.core.steady_state import compute_steady_state_score
+from src.core.sparse_table import build_sparse_table, query_sparse_table
+from src.core.multiresolution import find_operational_points_multires, find_operational_points_for_windows
 
 class TestFindOperationalPoints(unittest.TestCase):
     def setUp(self):
@@ -88,6 +93,145 @@ class TestFindOperationalPoints(unittest.TestCase):
 
         # add the check that "2024-11-13 10:00:00" is not in op_points
         self.assertNotIn(pd.Timestamp("2024-11-13 10:00:00"), op_points["Operational Points"].values)
-    
+
+    def test_steady_state_prepass(self):
+        """
+      In this test, we check that skipping the rows rejected by the steady-state pre-pass and checking the margins
+      coarse-to-fine does not change the results, on the test dataset and on random data with noisy steady states.
+      """
+        rng = np.random.default_rng(0)
+        times = pd.Timestamp("2024-11-12") + pd.to_timedelta(np.cumsum(rng.integers(5, 20, 2000)), unit="s")
+        levels = np.repeat(rng.uniform(0, 10, 40), 50)
+        random_data = pd.DataFrame({
+            "time": times,
+            "col1": levels + rng.normal(0, 0.3, 2000),
+            "col2": rng.normal(100, 1, 2000),
+            "col3": levels / 2 + rng.normal(0, 0.1, 2000)
+        })
+
+        for data in (self.filtered_data, random_data):
+            score, candidates = compute_steady_state_score(data, self.time_col, self.config["margins"],
+                                                           self.config["time_window"])
+            self.assertIsNotNone(candidates)
+            self.assertLess(candidates.sum(), len(data))
+
+            expected_op_points, expected_additional_info = find_operational_points(
+                data, self.time_col, self.mean_values, self.config
+            )
+            op_points, additional_info = find_operational_points(
+                data, self.time_col, self.mean_values, self.config, candidates
+            )
+            assert_frame_equal(op_points, expected_op_points)
+            assert_frame_equal(additional_info, expected_additional_info)
+
+            op_points, additional_info = find_operational_points_multires(
+                data, self.time_col, self.mean_values, self.config, candidates
+            )
+            assert_frame_equal(op_points, expected_op_points)
+            assert_frame_equal(additional_info, expected_additional_info)
+
+            # all operational points have a score <= 1
+            op_rows = data[self.time_col].isin(op_points["Operational Points"])
+            self.assertTrue((score[op_rows] <= 1).all())
+
+    def test_multiresolution_long_windows(self):
+        """
+      In this test, we check that the coarse-to-fine engine gives exactly the same results as the reference engine
+      for windows with hundreds of samples, NaN values and duplicated timestamps.
+      """
+        rng = np.random.default_rng(1)
+        times = pd.Timestamp("2024-11-12") + pd.to_timedelta(np.cumsum(rng.integers(0, 4, 2000)), unit="s")
+        levels = np.repeat(rng.uniform(0, 10, 10), 200)
+        data = pd.DataFrame({
+            "time": times,
+            "col1": levels + rng.normal(0, 0.3, 2000),
+            "col2": rng.integers(90, 110, 2000),
+            "col3": levels / 2 + rng.normal(0, 0.1, 2000)
+        })
+        data.loc[rng.integers(0, 2000, 5), "col1"] = np.nan
+        config = {**self.config, "time_window": 5, "margins": [{"column": "col1", "margin": 1.5},
+                                                               {"column": "col3", "margin": 0.5}]}
+
+        expected_op_points, expected_additional_info = find_operational_points(data, self.time_col, self.mean_values, config)
+        op_points, additional_info = find_operational_points_multires(data, self.time_col, self.mean_values, config)
+        self.assertGreater(len(op_points), 0)
+        assert_frame_equal(op_points, expected_op_points)
+        assert_frame_equal(additional_info, expected_additional_info, check_exact=True)
+
+    def test_multiple_time_windows(self):
+        """
+      In this test, we check that evaluating several time windows in a single pass gives the same results as
+      the reference engine for every window separately.
+      """
+        rng = np.random.default_rng(2)
+        times = pd.Timestamp("2024-11-12") + pd.to_timedelta(np.cumsum(rng.integers(1, 10, 1500)), unit="s")
+        levels = np.repeat(rng.uniform(0, 10, 15), 100)
+        data = pd.DataFrame({
+            "time": times,
+            "col1": levels + rng.normal(0, 0.3, 1500),
+            "col2": rng.normal(100, 1, 1500),
+            "col3": levels / 2 + rng.normal(0, 0.1, 1500)
+        })
+        config = {**self.config, "time_window": [1, 2, 5]}
+
+        results = find_operational_points_for_windows(data, self.time_col, self.mean_values, config)
+        self.assertListEqual(list(results), [1, 2, 5])
+        for time_window, (op_points, additional_info, _, _) in results.items():
+            expected_op_points, expected_additional_info = find_operational_points(
+                data, self.time_col, self.mean_values, {**config, "time_window": time_window}
+            )
+            assert_frame_equal(op_points, expected_op_points)
+            assert_frame_equal(additional_info, expected_additional_info)
+
+    def test_tolerant_margins(self):
+        """
+      In this test, we check that a margin with max_violation_fraction accepts windows with a few outliers, and that
+      the coarse-to-fine engine (with the steady-state pre-pass) gives exactly the same results as the reference engine.
+      """
+        rng = np.random.default_rng(6)
+        times = pd.Timestamp("2024-11-12") + pd.to_timedelta(np.cumsum(rng.integers(1, 3, 4000)), unit="s")
+        levels = np.repeat(rng.uniform(0, 10, 10), 400)
+        data = pd.DataFrame({
+            "time": times,
+            "col1": levels + rng.normal(0, 0.2, 4000),
+            "col2": rng.normal(100, 1, 4000),
+            "col3": levels / 2 + rng.normal(0, 0.05, 4000)
+        })
+        # single-sample spikes and a few NaN values
+        data.loc[rng.integers(0, 4000, 60), "col1"] += rng.choice([-5, 5], 60)
+        data.loc[rng.integers(0, 4000, 5), "col1"] = np.nan
+
+        strict_config = {**self.config, "time_window": 4, "margins": [{"column": "col1", "margin": 1},
+                                                                      {"column": "col3", "margin": 0.5}]}
+        tolerant_config = {**strict_config, "margins": [{"column": "col1", "margin": 1, "max_violation_fraction": 0.05},
+                                                        {"column": "col3", "margin": 0.5}]}
+
+        strict_op_points, _ = find_operational_points(data, self.time_col, self.mean_values, strict_config)
+        expected_op_points, expected_additional_info = find_operational_points(
+            data, self.time_col, self.mean_values, tolerant_config
+        )
+        self.assertGreater(len(expected_op_points), len(strict_op_points))
+
+        results = find_operational_points_for_windows(data, self.time_col, self.mean_values, tolerant_config)
+        op_points, additional_info, _, _ = results[4]
+        assert_frame_equal(op_points, expected_op_points)
+        assert_frame_equal(additional_info, expected_additional_info, check_exact=True)
+
+    def test_sparse_table(self):
+        """
+      In this test, we check the sparse table range min/max queries against a direct computation.
+      """
+        rng = np.random.default_rng(3)
+        values = rng.normal(0, 1, 500)
+        lo = rng.integers(0, 400, 200)
+        hi = lo + rng.integers(1, 100, 200)
+        min_table = build_sparse_table(values, 100, np.minimum)
+        max_table = build_sparse_table(values, 100, np.maximum)
+
+        np.testing.assert_array_equal(query_sparse_table(min_table, lo, hi, np.minimum),
+                                      [values[l:h].min() for l, h in zip(lo, hi)])
+        np.testing.assert_array_equal(query_sparse_table(max_table, lo, hi, np.maximum),
+                                      [values[l:h].max() for l, h in zip(lo, hi)])
+
 if __name__ == "__main__":
     unittest.main()
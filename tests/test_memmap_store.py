@@ -0,0 +1,118 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import yaml
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+import data_manager.memmap_store as memmap_store
+import core.steady_state as steady_state
+from src.main import analyse_operational_points
+from src.data_manager.load_data import load_parse_data
+from src.data_manager.process_data import filter_data
+
+class TestMemmapStore(unittest.TestCase):
+    def setUp(self):
+        self.time_col = "time"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memmap_dir = os.path.join(self.tmp.name, "memmap")
+        self.csv_file = os.path.join(self.tmp.name, "data.csv")
+        rng = np.random.default_rng(5)
+        levels = np.repeat(rng.normal(0, 5, 40), 100)
+        self.data = pd.DataFrame({
+            "Time": pd.date_range("2024-01-01", periods=4000, freq="30s"),
+            "col1": levels + rng.normal(0, 0.2, 4000),
+            "col2": levels * 2 + rng.normal(0, 0.2, 4000),
+            "col9": rng.choice([3, 3, 3, 4], 4000)
+        })
+        self.data.loc[rng.integers(0, 4000, 20), "col1"] = np.nan
+        self.data.to_csv(self.csv_file, index=False)
+
+        self.config = {
+            "time_window": [5, 20],
+            "row_to_remove": "1970-01-01 00:00:00",
+            "time_column": "time",
+            "mean_values": ["col1", "col2"],
+            "conditions": {"col9": 3},
+            "margins": [{"column": "col1", "margin": 1}, {"column": "col2", "margin": 1.5, "max_violation_fraction": 0.1}]
+        }
+
+        # small chunks, so that the conversion and the pre-pass cross many chunk borders
+        self.chunk_rows = (memmap_store.CHUNK_ROWS, steady_state.CHUNK_ROWS)
+        memmap_store.CHUNK_ROWS, steady_state.CHUNK_ROWS = 700, 500
+
+    def tearDown(self):
+        memmap_store.CHUNK_ROWS, steady_state.CHUNK_ROWS = self.chunk_rows
+        self.tmp.cleanup()
+
+    def analyse(self, **config):
+        config_file = os.path.join(self.tmp.name, "config.yaml")
+        with open(config_file, "w") as f:
+            yaml.safe_dump({**self.config, **config}, f)
+        return analyse_operational_points(config_file, self.csv_file, None)
+
+    def load_store(self, needed_columns):
+        return memmap_store.load_memmap_store(self.memmap_dir, self.csv_file, self.time_col, needed_columns,
+                                              {"col9": 3}, "1970-01-01 00:00:00")
+
+    def test_memmap_matches_in_memory(self):
+        """
+      In this test, we check that the memory-mapped mode finds the same operational points and mean values as the
+      in-memory run, for a sorted and a shuffled input file.
+      """
+        for shuffled in (False, True):
+            if shuffled:
+                self.data.sample(frac=1, random_state=0).to_csv(self.csv_file, index=False)
+            filtered_data, op_points, additional_info = self.analyse()
+            memmap_filtered_data, memmap_op_points, memmap_additional_info = self.analyse(memmap_dir=self.memmap_dir)
+
+            self.assertIsNone(memmap_filtered_data)
+            self.assertGreater(len(op_points[5]), 0)
+            for time_window in (5, 20):
+                assert_frame_equal(memmap_op_points[time_window], op_points[time_window])
+                assert_frame_equal(memmap_additional_info[time_window], additional_info[time_window])
+
+    def test_memmap_with_profiles(self):
+        """
+      In this test, we check that the memory-mapped mode with profiles returns None as filtered data (like without
+      profiles) and the same operational points as the in-memory run for every profile.
+      """
+        profiles = [{"name": "a", "time_window": [5]}, {"name": "b", "margins": [{"column": "col1", "margin": 2}]}]
+        _, op_points, _ = self.analyse(profiles=profiles)
+        memmap_filtered_data, memmap_op_points, _ = self.analyse(profiles=profiles, memmap_dir=self.memmap_dir)
+
+        self.assertIsNone(memmap_filtered_data)
+        for name in ("a", "b"):
+            for time_window in op_points[name]:
+                assert_frame_equal(memmap_op_points[name][time_window], op_points[name][time_window])
+
+    def test_store_contents_and_reuse(self):
+        """
+      In this test, we check that the store holds the filtered and sorted columns, that it is reused for a subset of
+      its columns (e.g. other margins), that it grows for new columns and that it is rebuilt when the file changes.
+      """
+        store = self.load_store(["col1", "col2", "col9"])
+        self.assertFalse(store["reused"])
+        expected = filter_data(load_parse_data(self.csv_file, self.time_col), ["col1", "col2", "col9"], self.time_col,
+                               {"col9": 3}, "1970-01-01 00:00:00")
+        self.assertEqual(store["rows"], len(expected))
+        np.testing.assert_array_equal(store["times"], expected[self.time_col].values.astype("datetime64[ns]").view("int64"))
+        np.testing.assert_array_equal(store["columns"]["col1"], expected["col1"].values)
+
+        self.assertTrue(self.load_store(["col1"])["reused"])
+
+        self.data["col3"] = 1.0
+        self.data.to_csv(self.csv_file, index=False)
+        os.utime(self.csv_file, ns=(0, os.stat(self.csv_file).st_mtime_ns + 1))
+        store = self.load_store(["col3", "col9"])
+        self.assertFalse(store["reused"])
+        self.assertEqual(sorted(store["columns"]), ["col1", "col2", "col3", "col9"])
+        self.assertTrue(self.load_store(["col1", "col3"])["reused"])
+        self.assertEqual(len(os.listdir(self.memmap_dir)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import yaml
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.utils.pipeline import run_pipeline
+from src.main import analyse_operational_points, analyse_input_files
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, "config.yaml")
+        with open(self.config_file, "w") as f:
+            yaml.safe_dump({
+                "time_window": 1,
+                "row_to_remove": "1970-01-01 00:00:00",
+                "time_column": "time",
+                "mean_values": ["col1", "col2", "col3"],
+                "conditions": {"col9": 3},
+                "margins": [{"column": "col1", "margin": 1}, {"column": "col3", "margin": 0.5}]
+            }, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stages_overlap(self):
+        """
+      In this test, we check that the stages process different items at the same time, that the results keep the
+      order of the items and that the stage stats are reported.
+      """
+        def slow_stage(offset):
+            def stage(item):
+                time.sleep(0.05)
+                return item + offset
+            return stage
+
+        start = time.perf_counter()
+        results, stats = run_pipeline(range(6), [("a", slow_stage(10)), ("b", slow_stage(100))])
+        self.assertListEqual(results, [110 + i for i in range(6)])
+        # sequential processing would take 12 x 0.05 s
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(stats["stages"]["b"]["items"], 6)
+        self.assertGreater(stats["stages"]["b"]["utilization"], 0.5)
+
+    def test_stage_error(self):
+        """
+      In this test, we check that an error in a stage stops the pipeline and is raised again.
+      """
+        def failing_stage(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item
+
+        with self.assertRaises(ValueError):
+            run_pipeline(range(100), [("read", lambda item: item), ("detect", failing_stage)], queue_size=1)
+
+    def test_multiple_input_files(self):
+        """
+      In this test, we check that analysing several files in the pipeline gives the same results as separate runs,
+      with one output sub dir per file.
+      """
+        other_file = os.path.join(self.tmp.name, "op_dataset.csv")
+        shutil.copy(self.test_file, other_file)
+        output_dir = os.path.join(self.tmp.name, "output")
+        results = analyse_input_files(self.config_file, [self.test_file, other_file], output_dir, save_filtered=False)
+        _, expected_op_points, expected_additional_info = analyse_operational_points(
+            self.config_file, self.test_file, None
+        )
+
+        self.assertListEqual(list(results), [self.test_file, other_file])
+        for _, op_points, additional_info in results.values():
+            assert_frame_equal(op_points, expected_op_points)
+            assert_frame_equal(additional_info, expected_additional_info)
+        for name in ("op_dataset", "op_dataset_2"):
+            self.assertTrue(os.path.exists(os.path.join(output_dir, name, "op_with_mean_values.xlsx")))
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "run_report.json")))
+
+    def test_multiple_input_files_without_result_files(self):
+        """
+      In this test, we check that the run report of every file is written to its sub dir also when no result file
+      is saved there (e.g. for the stdout formats of the CLI).
+      """
+        other_file = os.path.join(self.tmp.name, "op_dataset.csv")
+        shutil.copy(self.test_file, other_file)
+        output_dir = os.path.join(self.tmp.name, "output")
+        analyse_input_files(self.config_file, [self.test_file, other_file], output_dir, save_filtered=False,
+                            save_excel=False)
+
+        for name in ("op_dataset", "op_dataset_2"):
+            self.assertListEqual(os.listdir(os.path.join(output_dir, name)), ["run_report.json"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+import importlib.util
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.data_manager.process_data import filter_data
+from src.data_manager.load_data import load_parse_data
+from src.data_manager.polars_backend import scan_filter_data
+
+@unittest.skipUnless(importlib.util.find_spec("polars"), "polars is not installed")
+class TestPolarsBackend(unittest.TestCase):
+    def setUp(self):
+        self.time_col = "time"
+        self.row_to_remove = "1970-01-01 00:00:00"
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_backends_equal(self, input_file, needed_columns, conditions, row_to_remove, time_range=None):
+        expected = filter_data(load_parse_data(input_file, self.time_col, time_range, use_time_index=False),
+                               needed_columns, self.time_col, conditions, row_to_remove)
+        actual = scan_filter_data(input_file, self.time_col, needed_columns, conditions, row_to_remove, time_range)
+        assert_frame_equal(actual, expected)
+
+    def test_same_filtered_output(self):
+        """
+      In this test, we check that the polars backend gives the same filtered data as the pandas backend.
+      """
+        self.assert_backends_equal(self.test_file, ["col1", "col3", "col9"], {"col9": 3}, self.row_to_remove)
+        self.assert_backends_equal(self.test_file, ["col1", "col2"], {}, None)
+
+    def test_unsorted_file_with_missing_values(self):
+        """
+      In this test, we check both backends on a shuffled file with upper case column names, duplicated timestamps
+      (which keep their file order), missing values and timestamps, rows to remove and a time range.
+      """
+        rng = np.random.default_rng(4)
+        n = 5000
+        times = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(n) // 3 * 7, unit="s")
+        data = pd.DataFrame({
+            "Time": times.strftime("%Y-%m-%d %H:%M:%S"),
+            "COL1": rng.normal(100, 5, n).round(4),
+            "col2": rng.integers(0, 3, n),
+            "col3": rng.normal(0, 1, n)
+        })
+        data.loc[rng.integers(0, n, 50), "COL1"] = np.nan
+        data.loc[rng.integers(0, n, 20), "Time"] = self.row_to_remove
+        data.loc[rng.integers(0, n, 5), "Time"] = None
+        input_file = os.path.join(self.tmp.name, "shuffled.csv")
+        data.sample(frac=1, random_state=0).to_csv(input_file, index=False)
+
+        self.assert_backends_equal(input_file, ["col1", "col2"], {"col2": 1}, self.row_to_remove)
+        self.assert_backends_equal(input_file, ["col1", "col3"], {}, self.row_to_remove,
+                                   (times[1000], times[3000]))
+
+    def test_non_iso_time_format(self):
+        """
+      In this test, we check that time columns in non-ISO formats (ambiguous dd.mm.yyyy dates, which polars and pandas
+      infer differently, and mm/dd/yyyy dates, which polars cannot infer) are parsed like in the pandas backend,
+      with rows to remove and a time range.
+      """
+        rng = np.random.default_rng(6)
+        n = 3000
+        times = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(n) * 300, unit="s")
+        for time_format in ("%d.%m.%Y %H:%M:%S", "%m/%d/%Y %H:%M:%S"):
+            data = pd.DataFrame({
+                "Time": times.strftime(time_format),
+                "col1": rng.normal(100, 5, n).round(4),
+                "col2": rng.integers(0, 3, n)
+            })
+            data.loc[rng.integers(1, n, 20), "Time"] = pd.Timestamp(self.row_to_remove).strftime(time_format)
+            input_file = os.path.join(self.tmp.name, "non_iso.csv")
+            data.sample(frac=1, random_state=1).to_csv(input_file, index=False)
+
+            self.assert_backends_equal(input_file, ["col1", "col2"], {"col2": 1}, self.row_to_remove)
+            self.assert_backends_equal(input_file, ["col1"], {}, self.row_to_remove,
+                                       (pd.Timestamp("2024-01-03"), pd.Timestamp("2024-03-01")))
+
+    def test_missing_column(self):
+        """
+      In this test, we check that a missing needed column is reported like in the pandas backend.
+      """
+        with self.assertRaises(ValueError):
+            scan_filter_data(self.test_file, self.time_col, ["not_a_column"], {}, None)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+import yaml
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.main import analyse_operational_points
+
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        self.config = {
+            "time_window": 1,
+            "row_to_remove": "1970-01-01 00:00:00",
+            "time_column": "time",
+            "mean_values": ["col1", "col2", "col3"],
+            "conditions": {},
+            "margins": [{"column": "col1", "margin": 1}, {"column": "col3", "margin": 0.5}]
+        }
+        self.profiles = [
+            {"name": "mode3", "conditions": {"col9": 3}},
+            {"name": "wide", "time_window": [1, 2], "margins": [{"column": "col1", "margin": 10}],
+             "mean_values": ["col4", "col5"]}
+        ]
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_config(self, name, config):
+        config_file = os.path.join(self.tmp.name, f"{name}.yaml")
+        with open(config_file, "w") as f:
+            yaml.safe_dump(config, f)
+        return config_file
+
+    def test_profiles_match_separate_runs(self):
+        """
+      In this test, we check that every profile of a multi-profile config gives the same results as a separate run
+      with the profile's settings.
+      """
+        config_file = self.write_config("profiles", {**self.config, "profiles": self.profiles})
+        _, op_points, additional_info = analyse_operational_points(config_file, self.test_file, None)
+        self.assertListEqual(list(op_points), ["mode3", "wide"])
+
+        for profile in self.profiles:
+            overrides = {key: value for key, value in profile.items() if key != "name"}
+            profile_file = self.write_config(profile["name"], {**self.config, **overrides})
+            _, expected_op_points, expected_additional_info = analyse_operational_points(profile_file, self.test_file, None)
+
+            if isinstance(expected_op_points, dict):
+                self.assertListEqual(list(op_points[profile["name"]]), list(expected_op_points))
+                for time_window in expected_op_points:
+                    assert_frame_equal(op_points[profile["name"]][time_window], expected_op_points[time_window])
+                    assert_frame_equal(additional_info[profile["name"]][time_window],
+                                       expected_additional_info[time_window])
+            else:
+                assert_frame_equal(op_points[profile["name"]], expected_op_points)
+                assert_frame_equal(additional_info[profile["name"]], expected_additional_info)
+
+    def test_summary_on_cache_hit(self):
+        """
+      In this test, we check that the combined profiles summary is also saved when the results are loaded from the
+      result cache.
+      """
+        config_file = self.write_config("profiles", {**self.config, "profiles": self.profiles,
+                                                     "cache_dir": os.path.join(self.tmp.name, "cache")})
+        for output_dir in ("o1", "o2"):
+            output_dir = os.path.join(self.tmp.name, output_dir)
+            analyse_operational_points(config_file, self.test_file, output_dir, save_filtered=False)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "profiles_summary.xlsx")))
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "mode3", "op_with_mean_values.xlsx")))
+
+        with open(os.path.join(output_dir, "run_report.json")) as f:
+            self.assertTrue(json.load(f)["cache_hit"])
+
+    def test_duplicate_profile_names(self):
+        """
+      In this test, we check that a config with two profiles of the same name is rejected.
+      """
+        config_file = self.write_config("profiles", {**self.config, "profiles": [self.profiles[0], self.profiles[0]]})
+        with self.assertRaises(ValueError):
+            analyse_operational_points(config_file, self.test_file, None)
+
+    def test_invalid_profile_names(self):
+        """
+      In this test, we check that profile names that are not valid sub dir names (e.g. with path separators or "..")
+      are rejected, so that no results are written outside of the output dir.
+      """
+        for name in ("../../etc", "x/y", "x\\y", "..", ".hidden", "a:b", "name "):
+            config_file = self.write_config("profiles", {**self.config, "profiles": [{**self.profiles[0], "name": name}]})
+            with self.assertRaises(ValueError, msg=name):
+                analyse_operational_points(config_file, self.test_file, None)
+
+if __name__ == "__main__":
+    unittest.main()
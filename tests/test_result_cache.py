@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.data_manager.result_cache import (
+    get_cache_key, load_cached_result, store_cached_result, CACHE_INDEX_FILE
+)
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.engine = "reference"
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        self.config = {"time_window": 1, "margins": [{"column": "col1", "margin": 1}]}
+        self.op_points = pd.DataFrame({"Operational Points": [pd.Timestamp("2024-11-12 10:00:00")]})
+        self.additional_info = pd.DataFrame({"time": [pd.Timestamp("2024-11-12 10:00:00")], "col1": [100.0]})
+        self.report = {"operational_points": 1}
+        self.cache = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache.cleanup()
+
+    def test_hit_and_miss(self):
+        """
+      In this test, we check that a stored result is returned for the same config and input file,
+      and that changing the config results in a cache miss.
+      """
+        key = get_cache_key(self.config, self.test_file, self.engine)
+        self.assertIsNone(load_cached_result(self.cache.name, key, self.engine))
+
+        store_cached_result(self.cache.name, key, self.engine, self.op_points, self.additional_info, self.report, 4)
+        op_points, additional_info, report = load_cached_result(self.cache.name, key, self.engine)
+        assert_frame_equal(op_points, self.op_points)
+        assert_frame_equal(additional_info, self.additional_info)
+        self.assertDictEqual(report, self.report)
+
+        other_key = get_cache_key({**self.config, "time_window": 2}, self.test_file, self.engine)
+        self.assertNotEqual(key, other_key)
+        self.assertIsNone(load_cached_result(self.cache.name, other_key, self.engine))
+
+    def test_lru_eviction(self):
+        """
+      In this test, we check that the least recently used entry is evicted when the size limit is exceeded.
+      """
+        keys = [get_cache_key({**self.config, "time_window": window}, self.test_file, self.engine) for window in (1, 2, 3)]
+        store_cached_result(self.cache.name, keys[0], self.engine, self.op_points, self.additional_info, self.report, 2)
+        store_cached_result(self.cache.name, keys[1], self.engine, self.op_points, self.additional_info, self.report, 2)
+
+        # use the first entry, so that the second one becomes the least recently used
+        self.assertIsNotNone(load_cached_result(self.cache.name, keys[0], self.engine))
+        store_cached_result(self.cache.name, keys[2], self.engine, self.op_points, self.additional_info, self.report, 2)
+
+        self.assertIsNotNone(load_cached_result(self.cache.name, keys[0], self.engine))
+        self.assertIsNone(load_cached_result(self.cache.name, keys[1], self.engine))
+        self.assertIsNotNone(load_cached_result(self.cache.name, keys[2], self.engine))
+
+    def test_invalidation_on_engine_or_version_change(self):
+        """
+      In this test, we check that the whole cache is invalidated when the engine or the library version changes.
+      """
+        key = get_cache_key(self.config, self.test_file, self.engine)
+        store_cached_result(self.cache.name, key, self.engine, self.op_points, self.additional_info, self.report, 4)
+
+        self.assertIsNone(load_cached_result(self.cache.name, key, "other_engine"))
+        self.assertFalse(os.path.exists(os.path.join(self.cache.name, key)))
+
+        store_cached_result(self.cache.name, key, self.engine, self.op_points, self.additional_info, self.report, 4)
+        index_file = os.path.join(self.cache.name, CACHE_INDEX_FILE)
+        with open(index_file, "r") as f:
+            index = json.load(f)
+        index["version"] = "0.0.0"
+        with open(index_file, "w") as f:
+            json.dump(index, f)
+        self.assertIsNone(load_cached_result(self.cache.name, key, self.engine))
+
+    def test_concurrent_access(self):
+        """
+      In this test, we check that concurrent loads and stores (as in the read and write stages of a pipeline) keep
+      the index consistent with the entries on disk, so that the size limit still holds.
+      """
+        keys = [get_cache_key({**self.config, "time_window": window}, self.test_file, self.engine) for window in range(60)]
+        for key in keys[:20]:
+            store_cached_result(self.cache.name, key, self.engine, self.op_points, self.additional_info, self.report, 30)
+
+        def access(key):
+            if load_cached_result(self.cache.name, key, self.engine) is None:
+                store_cached_result(self.cache.name, key, self.engine, self.op_points, self.additional_info,
+                                    self.report, 30)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(access, keys))
+
+        with open(os.path.join(self.cache.name, CACHE_INDEX_FILE), "r") as f:
+            index = json.load(f)
+        entry_dirs = [name for name in os.listdir(self.cache.name) if name != CACHE_INDEX_FILE]
+        self.assertEqual(len(index["entries"]), 30)
+        self.assertCountEqual(entry_dirs, index["entries"])
+
+if __name__ == "__main__":
+    unittest.main()
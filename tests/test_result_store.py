@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+import importlib.util
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.data_manager.process_data import filter_data
+from src.data_manager.load_data import load_parse_data
+from src.core.operational_points import find_operational_points
+from src.data_manager.result_store import append_results, query_results
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.time_col = "time"
+        self.mean_values = ["col1", "col2", "col3"]
+        self.test_file = os.path.join("test_IO", "op_dataset.csv")
+        data = load_parse_data(self.test_file, self.time_col)
+        filtered_data = filter_data(data, self.mean_values, self.time_col, {}, None)
+        config = {"time_window": 1, "margins": [{"column": "col1", "margin": 1}, {"column": "col3", "margin": 0.5}]}
+        _, self.additional_info = find_operational_points(filtered_data, self.time_col, self.mean_values, config)
+        self.store = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.store.cleanup()
+
+    def test_append_only(self):
+        """
+      In this test, we check that every run is appended to the store instead of overwriting the previous one.
+      """
+        append_results(self.store.name, self.additional_info, self.time_col, "hash1", "plant_a")
+        append_results(self.store.name, self.additional_info, self.time_col, "hash2", "plant_a")
+
+        results = query_results(self.store.name)
+        self.assertEqual(len(results), 2 * len(self.additional_info))
+        self.assertSetEqual(set(results["config_hash"]), {"hash1", "hash2"})
+        self.assertTrue(os.path.isdir(os.path.join(self.store.name, "plant=plant_a", "date=2024-11-12")))
+
+    def test_query_filters(self):
+        """
+      In this test, we check that the time range, plant and value range filters are applied.
+      """
+        append_results(self.store.name, self.additional_info, self.time_col, "hash1", "plant_a")
+        append_results(self.store.name, self.additional_info, self.time_col, "hash1", "plant_b")
+
+        results = query_results(
+            self.store.name, start="2024-11-13 00:00:00", end="2024-11-14 23:59:59", plant="plant_a",
+            value_ranges={"col1": (None, 106.0)}
+        )
+        self.assertListEqual(results["operational_point"].tolist(), [pd.Timestamp("2024-11-14 10:00:00")])
+        self.assertListEqual(results["plant"].tolist(), ["plant_a"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# heavy dependencies that must not be imported on the given path
+GUI_MODULES = ["tkinter", "ttkbootstrap", "matplotlib"]
+LAZY_MODULES = ["openpyxl", "pydantic"]
+
+# upper bound for the import time of the headless entry point on top of the import time of pandas (in seconds),
+# measured at about 0.05 s, pandas itself takes about 0.35 s
+IMPORT_TIME_BUDGET = 0.25
+
+# number of imports measured per statement, the fastest one is compared to reduce the noise of the machine
+IMPORT_RUNS = 3
+
+def import_in_subprocess(statement):
+    """
+  This function runs the import statement in a fresh interpreter and returns the import time and the loaded modules.
+  """
+    code = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+class TestStartupTime(unittest.TestCase):
+    def test_cli_imports_nothing_heavy(self):
+        """
+      In this test, we check that the console-script entry point itself only imports the standard library.
+      """
+        result = import_in_subprocess("import cli; cli.build_parser()")
+        for module in GUI_MODULES + LAZY_MODULES + ["pandas"]:
+            self.assertNotIn(module, result["modules"])
+
+    def test_headless_run_path(self):
+        """
+      In this test, we check that the headless analysis path does not import the GUI stack or the lazily imported
+      dependencies, and that its import time stays within the budget on top of the import time of pandas.
+      """
+        results = [import_in_subprocess("import cli, main") for _ in range(IMPORT_RUNS)]
+        for module in GUI_MODULES + LAZY_MODULES:
+            self.assertNotIn(module, results[0]["modules"])
+
+        pandas_seconds = min(import_in_subprocess("import pandas")["seconds"] for _ in range(IMPORT_RUNS))
+        self.assertLess(min(result["seconds"] for result in results), pandas_seconds + IMPORT_TIME_BUDGET)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+import yaml
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from src.data_manager.load_data import load_parse_data
+from src.data_manager.time_index import get_index_file, get_time_range, load_time_index
+from src.main import analyse_operational_points
+
+try:
+    import polars
+except ImportError:
+    polars = None
+
+class TestTimeIndex(unittest.TestCase):
+    def setUp(self):
+        self.time_col = "time"
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_file = os.path.join(self.tmp.name, "data.csv")
+        rng = np.random.default_rng(3)
+        self.data = pd.DataFrame({
+            "Time": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.cumsum(rng.integers(1, 120, 25000)), unit="s"),
+            "col1": rng.normal(100, 1, 25000).round(3)
+        })
+        self.data.to_csv(self.csv_file, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_range_read_matches_full_read(self):
+        """
+      In this test, we check that reading a time range through the sidecar index gives the same rows as parsing
+      the whole file and filtering it, also for ranges at the start and the end of the file.
+      """
+        times = self.data["Time"]
+        ranges = [(times.iloc[12345], times.iloc[15000]), (None, times.iloc[100]), (times.iloc[24900], None)]
+        for time_range in ranges:
+            assert_frame_equal(
+                load_parse_data(self.csv_file, self.time_col, time_range),
+                load_parse_data(self.csv_file, self.time_col, time_range, use_time_index=False)
+            )
+
+        # a range before the first row contains no data
+        with self.assertRaises(ValueError):
+            load_parse_data(self.csv_file, self.time_col, (None, times.iloc[0] - pd.Timedelta(hours=1)))
+        self.assertTrue(os.path.exists(get_index_file(self.csv_file)))
+
+    def test_index_invalidation(self):
+        """
+      In this test, we check that the index is rebuilt when the file changes, and that unsorted files are marked
+      as such (then the whole file is parsed).
+      """
+        index = load_time_index(self.csv_file, self.time_col)
+        self.assertTrue(index["sorted"])
+        self.assertEqual(index["rows"], 25000)
+
+        shuffled = self.data.sample(frac=1, random_state=0)
+        shuffled.to_csv(self.csv_file, index=False)
+        os.utime(self.csv_file, ns=(0, index["source_mtime_ns"] + 1))
+        self.assertFalse(load_time_index(self.csv_file, self.time_col)["sorted"])
+
+        time_range = (self.data["Time"].iloc[500], self.data["Time"].iloc[700])
+        data = load_parse_data(self.csv_file, self.time_col, time_range)
+        self.assertEqual(len(data), 201)
+        self.assertTrue(data[self.time_col].is_monotonic_increasing)
+
+    def test_time_range_padding(self):
+        """
+      In this test, we check that the configured range is padded by the longest time window.
+      """
+        config = {"start": "2024-01-02 00:00:00", "end": None, "time_window": [2, 10]}
+        self.assertEqual(get_time_range(config), (pd.Timestamp("2024-01-01 23:50:00"), None))
+        self.assertIsNone(get_time_range({"start": None, "end": None, "time_window": 2}))
+
+        config["profiles"] = [{"name": "long", "time_window": 30}]
+        self.assertEqual(get_time_range(config), (pd.Timestamp("2024-01-01 23:30:00"), None))
+
+    def test_points_within_time_range(self):
+        """
+      In this test, we check that the operational points found in the padding of the time range are dropped, for
+      every input source (pandas, polars, database and memory-mapped).
+      """
+        steady_data = pd.DataFrame({
+            "time": pd.date_range("2024-01-01 10:00:00", "2024-01-01 15:00:00", freq="10s"),
+            "col1": 100.0
+        })
+        steady_data.to_csv(self.csv_file, index=False)
+        database_file = os.path.join(self.tmp.name, "data.db")
+        with sqlite3.connect(database_file) as connection:
+            steady_data.assign(time=steady_data["time"].astype(str)).to_sql("data", connection, index=False)
+
+        config = {
+            "time_window": 30,
+            "time_column": "time",
+            "mean_values": ["col1"],
+            "conditions": {},
+            "margins": [{"column": "col1", "margin": 1}],
+            "start": "2024-01-01 12:00:00",
+            "end": "2024-01-01 13:00:00",
+            "table": "data"
+        }
+        runs = [({}, self.csv_file), ({"memmap_dir": os.path.join(self.tmp.name, "memmap")}, self.csv_file),
+                ({}, database_file)]
+        if polars is not None:
+            runs.append(({"backend": "polars"}, self.csv_file))
+
+        config_file = os.path.join(self.tmp.name, "config.yaml")
+        for overrides, input_file in runs:
+            with open(config_file, "w") as f:
+                yaml.safe_dump({**config, **overrides}, f)
+            _, op_points, additional_info = analyse_operational_points(config_file, input_file, None)
+            self.assertListEqual(
+                list(op_points["Operational Points"]),
+                [pd.Timestamp("2024-01-01 12:00:00"), pd.Timestamp("2024-01-01 12:15:00"),
+                 pd.Timestamp("2024-01-01 12:30:00"), pd.Timestamp("2024-01-01 12:45:00"),
+                 pd.Timestamp("2024-01-01 13:00:00")]
+            )
+            self.assertEqual(len(additional_info), 5)
+
+if __name__ == "__main__":
+    unittest.main()